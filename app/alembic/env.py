@@ -6,7 +6,7 @@ from dotenv import load_dotenv
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
-from app.models import SQLModel
+from app.models import TRANSACTION_SEARCH_INDEXES, SQLModel
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -31,6 +31,18 @@ if config.config_file_name is not None:
 
 target_metadata = SQLModel.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # the search index objects are created by raw DDL, not the metadata, so
+    # autogenerate must not try to drop them
+    if reflected and type_ == "table" and name.startswith("transaction_fts"):
+        return False
+    if reflected and type_ == "index" and name in TRANSACTION_SEARCH_INDEXES:
+        return False
+
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -53,6 +65,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -75,7 +88,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,36 @@
+"""transaction import hash
+
+Revision ID: 3c9e1f27a4d8
+Revises: b57174dffbd5
+Create Date: 2026-10-18 16:02:19.774310
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9e1f27a4d8"
+down_revision: Union[str, None] = "b57174dffbd5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "transaction",
+        sa.Column(
+            "import_hash", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True
+        ),
+    )
+    op.create_index(
+        "ix_transaction_import_hash", "transaction", ["import_hash"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transaction_import_hash", table_name="transaction")
+    op.drop_column("transaction", "import_hash")
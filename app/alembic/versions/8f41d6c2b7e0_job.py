@@ -0,0 +1,53 @@
+"""job
+
+Revision ID: 8f41d6c2b7e0
+Revises: 3c9e1f27a4d8
+Create Date: 2026-10-18 17:21:44.120583
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = "8f41d6c2b7e0"
+down_revision: Union[str, None] = "3c9e1f27a4d8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JOB_KIND = sa.Enum("IMPORT_CSV", "EXPORT_CSV", name="jobkind")
+JOB_STATUS = sa.Enum("PENDING", "RUNNING", "SUCCEEDED", "FAILED", name="jobstatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job",
+        sa.Column("id", sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("kind", JOB_KIND, nullable=False),
+        sa.Column("status", JOB_STATUS, nullable=False),
+        sa.Column("processed_rows", sa.Integer(), nullable=False),
+        sa.Column(
+            "result", sa.Text().with_variant(mysql.LONGTEXT(), "mysql"), nullable=True
+        ),
+        sa.Column("error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_job_user_id"), "job", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_job_user_id"), table_name="job")
+    op.drop_table("job")
+    JOB_STATUS.drop(op.get_bind(), checkfirst=True)
+    JOB_KIND.drop(op.get_bind(), checkfirst=True)
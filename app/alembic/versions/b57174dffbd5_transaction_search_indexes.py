@@ -0,0 +1,77 @@
+"""transaction search indexes
+
+Revision ID: b57174dffbd5
+Revises: eedbbdb74578
+Create Date: 2026-10-18 13:47:05.318220
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b57174dffbd5"
+down_revision: Union[str, None] = "eedbbdb74578"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of app.models.TRANSACTION_SEARCH_DDL (plus the FTS rebuild for
+# existing rows): a migration must keep creating what it created when it was
+# written, so later model edits belong in a new revision.
+UPGRADE_STATEMENTS = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE transaction_fts USING fts5("
+        "name, description, content='transaction', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER transaction_fts_ai AFTER INSERT ON "transaction" BEGIN '
+        "INSERT INTO transaction_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END",
+        'CREATE TRIGGER transaction_fts_ad AFTER DELETE ON "transaction" BEGIN '
+        "INSERT INTO transaction_fts(transaction_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); END",
+        "CREATE TRIGGER transaction_fts_au AFTER UPDATE OF name, description "
+        'ON "transaction" BEGIN '
+        "INSERT INTO transaction_fts(transaction_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO transaction_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END",
+        "INSERT INTO transaction_fts(transaction_fts) VALUES ('rebuild')",
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        'CREATE INDEX ix_transaction_name_trgm ON "transaction" '
+        "USING gin (name gin_trgm_ops)",
+        'CREATE INDEX ix_transaction_description_trgm ON "transaction" '
+        "USING gin (description gin_trgm_ops)",
+    ],
+    "mysql": [
+        "CREATE FULLTEXT INDEX ix_transaction_name_description_fulltext "
+        "ON `transaction` (name, description)",
+    ],
+}
+DOWNGRADE_STATEMENTS = {
+    "sqlite": [
+        "DROP TRIGGER transaction_fts_au",
+        "DROP TRIGGER transaction_fts_ad",
+        "DROP TRIGGER transaction_fts_ai",
+        "DROP TABLE transaction_fts",
+    ],
+    "postgresql": [
+        "DROP INDEX ix_transaction_description_trgm",
+        "DROP INDEX ix_transaction_name_trgm",
+    ],
+    "mysql": [
+        "DROP INDEX ix_transaction_name_description_fulltext ON `transaction`",
+    ],
+}
+
+
+def upgrade() -> None:
+    for statement in UPGRADE_STATEMENTS.get(op.get_context().dialect.name, []):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in DOWNGRADE_STATEMENTS.get(op.get_context().dialect.name, []):
+        op.execute(statement)
@@ -0,0 +1,36 @@
+"""transaction month version
+
+Revision ID: c2a7e5b91d34
+Revises: 8f41d6c2b7e0
+Create Date: 2026-10-18 18:10:52.331907
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c2a7e5b91d34"
+down_revision: Union[str, None] = "8f41d6c2b7e0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transaction_month_version",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("year_month", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "year_month"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("transaction_month_version")
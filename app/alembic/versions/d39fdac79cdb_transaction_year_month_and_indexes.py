@@ -0,0 +1,60 @@
+"""transaction year_month and indexes
+
+Revision ID: d39fdac79cdb
+Revises: 66bea7f32ba2
+Create Date: 2026-10-18 10:12:41.503118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d39fdac79cdb"
+down_revision: Union[str, None] = "66bea7f32ba2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+YEAR_MONTH_EXPRESSIONS = {
+    "mysql": "YEAR(transaction_date) * 100 + MONTH(transaction_date)",
+    "sqlite": "CAST(strftime('%Y%m', transaction_date) AS INTEGER)",
+}
+DEFAULT_YEAR_MONTH_EXPRESSION = (
+    "CAST(EXTRACT(YEAR FROM transaction_date) AS INTEGER) * 100"
+    " + CAST(EXTRACT(MONTH FROM transaction_date) AS INTEGER)"
+)
+
+
+def upgrade() -> None:
+    dialect_name = op.get_context().dialect.name
+    expression = YEAR_MONTH_EXPRESSIONS.get(dialect_name, DEFAULT_YEAR_MONTH_EXPRESSION)
+    # SQLite can only add VIRTUAL generated columns through ALTER TABLE
+    persisted = None if dialect_name == "sqlite" else True
+
+    op.add_column(
+        "transaction",
+        sa.Column(
+            "year_month",
+            sa.Integer(),
+            sa.Computed(sa.text(expression), persisted=persisted),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_transaction_user_id_transaction_date",
+        "transaction",
+        ["user_id", "transaction_date"],
+    )
+    op.create_index(
+        "ix_transaction_user_id_year_month",
+        "transaction",
+        ["user_id", "year_month"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transaction_user_id_year_month", table_name="transaction")
+    op.drop_index("ix_transaction_user_id_transaction_date", table_name="transaction")
+    op.drop_column("transaction", "year_month")
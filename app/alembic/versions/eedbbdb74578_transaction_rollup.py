@@ -0,0 +1,95 @@
+"""transaction rollup
+
+Revision ID: eedbbdb74578
+Revises: d39fdac79cdb
+Create Date: 2026-10-18 11:02:17.904512
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "eedbbdb74578"
+down_revision: Union[str, None] = "d39fdac79cdb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    transaction_type = sa.Enum(
+        "OUTCOME", "INCOME", name="transactiontype"
+    ).with_variant(
+        postgresql.ENUM("OUTCOME", "INCOME", name="transactiontype", create_type=False),
+        "postgresql",
+    )
+
+    op.create_table(
+        "transaction_rollup",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("year_month", sa.Integer(), nullable=False),
+        sa.Column("type", transaction_type, nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.Column("total_value", sa.Float(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "year_month", "type", "tag_id"),
+    )
+
+    transaction = sa.table(
+        "transaction",
+        sa.column("id", sa.Integer()),
+        sa.column("user_id", sa.Integer()),
+        sa.column("year_month", sa.Integer()),
+        sa.column("type", transaction_type),
+        sa.column("tag_id", sa.Integer()),
+        sa.column("value", sa.Float()),
+    )
+    transaction_rollup = sa.table(
+        "transaction_rollup",
+        sa.column("user_id", sa.Integer()),
+        sa.column("year_month", sa.Integer()),
+        sa.column("type", transaction_type),
+        sa.column("tag_id", sa.Integer()),
+        sa.column("total_value", sa.Float()),
+        sa.column("transaction_count", sa.Integer()),
+    )
+    tag_id = sa.func.coalesce(transaction.c.tag_id, 0)
+
+    op.execute(
+        transaction_rollup.insert().from_select(
+            [
+                "user_id",
+                "year_month",
+                "type",
+                "tag_id",
+                "total_value",
+                "transaction_count",
+            ],
+            sa.select(
+                transaction.c.user_id,
+                transaction.c.year_month,
+                transaction.c.type,
+                tag_id,
+                sa.func.sum(transaction.c.value),
+                sa.func.count(transaction.c.id),
+            )
+            .where(transaction.c.user_id.isnot(None))
+            .group_by(
+                transaction.c.user_id,
+                transaction.c.year_month,
+                transaction.c.type,
+                tag_id,
+            ),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("transaction_rollup")
@@ -0,0 +1,51 @@
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from app.schemas import TagPublic
+
+
+@dataclass(frozen=True)
+class TagCacheSnapshot:
+    version: str
+    tags: list[TagPublic]
+    tags_by_id: dict[int, TagPublic] = field(repr=False)
+    tags_by_name: dict[str, TagPublic] = field(repr=False)
+
+
+class TagCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: TagCacheSnapshot | None = None
+
+    async def get(
+        self, load_tags: Callable[[], Awaitable[list[TagPublic]]]
+    ) -> TagCacheSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._build_snapshot(await load_tags())
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = snapshot
+
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    @staticmethod
+    def _build_snapshot(tags: list[TagPublic]) -> TagCacheSnapshot:
+        content = "\n".join(f"{tag.id}:{tag.name}" for tag in tags)
+        version = hashlib.sha256(content.encode()).hexdigest()[:16]
+
+        return TagCacheSnapshot(
+            version=version,
+            tags=tags,
+            tags_by_id={tag.id: tag for tag in tags},
+            tags_by_name={tag.name: tag for tag in tags},
+        )
+
+
+tag_cache = TagCache()
@@ -0,0 +1,9 @@
+import os
+
+from app.cache.ttl_cache import TTLCache
+from app.schemas import UserPrincipal
+
+user_principal_cache: TTLCache[UserPrincipal] = TTLCache(
+    max_size=int(os.getenv("USER_PRINCIPAL_CACHE_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("USER_PRINCIPAL_CACHE_TTL_SECONDS", "300")),
+)
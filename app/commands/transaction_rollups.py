@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+import sys
+
+from app.config.db import async_session_maker
+from app.service.transaction_rollup_service import TransactionRollupService
+
+
+async def run(action: str, user_id: int | None):
+    async with async_session_maker() as session:
+        transaction_rollup_service = TransactionRollupService(session)
+
+        if action == "rebuild":
+            rebuilt_rollups = await transaction_rollup_service.rebuild_rollups(user_id)
+            print(f"Rebuilt {rebuilt_rollups} rollup rows")
+            return
+
+        drifted_rollups = await transaction_rollup_service.verify_rollups(user_id)
+        for drifted_rollup in drifted_rollups:
+            drifted_user_id, year_month, transaction_type, tag_id = drifted_rollup[
+                "key"
+            ]
+            print(
+                f"user_id={drifted_user_id} year_month={year_month} "
+                f"type={transaction_type.value} tag_id={tag_id} "
+                f"stored={drifted_rollup['stored']} "
+                f"expected={drifted_rollup['expected']}"
+            )
+
+        if drifted_rollups:
+            print(f"{len(drifted_rollups)} rollup rows drifted")
+            sys.exit(1)
+
+        print("Rollups are consistent")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verify or rebuild the monthly transaction rollups."
+    )
+    parser.add_argument("action", choices=["verify", "rebuild"])
+    parser.add_argument("--user-id", type=int)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.action, args.user_id))
+
+
+if __name__ == "__main__":
+    main()
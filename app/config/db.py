@@ -1,18 +1,141 @@
 import os
+from functools import cache
 
 from dotenv import load_dotenv
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import create_engine, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-import app.models
-import app.schemas
+from app.metrics.pool_metrics import PoolMetrics, create_timed_pool_class
 
 load_dotenv()
 
 LOG_QUERIES = False
 
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true")
+DB_WARM_UP = os.getenv("DB_WARM_UP", "false").lower() in ("1", "true")
+REPLICA_READ_YOUR_WRITES_SECONDS = float(
+    os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "5")
+)
+# request methods served by the replica; every other method writes
+READ_METHODS = {"GET", "HEAD"}
+
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+
+def get_async_database_url(database_url: str):
+    url = make_url(database_url)
+    backend_name = url.get_backend_name()
+
+    if backend_name not in ASYNC_DRIVERS:
+        return url
+
+    return url.set(drivername=f"{backend_name}+{ASYNC_DRIVERS[backend_name]}")
+
+
+def get_engine_options(
+    database_url: str, pool_class: type[QueuePool], metrics: PoolMetrics
+):
+    url = make_url(database_url)
+    options = {"echo": LOG_QUERIES, "pool_pre_ping": DB_POOL_PRE_PING}
+
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    return {
+        **options,
+        "poolclass": create_timed_pool_class(pool_class, metrics),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
+
 database_url = os.getenv("DATABASE_URL")
-engine = create_engine(database_url, echo=LOG_QUERIES)
+async_database_url = os.getenv("ASYNC_DATABASE_URL") or get_async_database_url(
+    database_url
+)
+database_replica_url = os.getenv("DATABASE_REPLICA_URL")
+async_database_replica_url = database_replica_url and get_async_database_url(
+    database_replica_url
+)
+
+pool_metrics = [PoolMetrics("sync"), PoolMetrics("async"), PoolMetrics("replica")]
+sync_pool_metrics, async_pool_metrics, replica_pool_metrics = pool_metrics
+
+
+# engines are built on first use so importing the app (a serverless cold
+# start) doesn't load the database drivers before a request needs them
+@cache
+def get_engine():
+    return create_engine(
+        database_url, **get_engine_options(database_url, QueuePool, sync_pool_metrics)
+    )
+
+
+@cache
+def get_async_engine():
+    return create_async_engine(
+        async_database_url,
+        **get_engine_options(
+            async_database_url, AsyncAdaptedQueuePool, async_pool_metrics
+        ),
+    )
+
+
+@cache
+def get_async_session_maker():
+    return async_sessionmaker(
+        get_async_engine(), class_=AsyncSession, expire_on_commit=False
+    )
+
+
+@cache
+def get_replica_async_engine():
+    if not async_database_replica_url:
+        return get_async_engine()
+
+    return create_async_engine(
+        async_database_replica_url,
+        **get_engine_options(
+            async_database_replica_url, AsyncAdaptedQueuePool, replica_pool_metrics
+        ),
+    )
+
+
+@cache
+def get_replica_async_session_maker():
+    return async_sessionmaker(
+        get_replica_async_engine(), class_=AsyncSession, expire_on_commit=False
+    )
+
+
+def async_session_maker() -> AsyncSession:
+    return get_async_session_maker()()
+
+
+def replica_session_maker() -> AsyncSession:
+    return get_replica_async_session_maker()()
+
+
+async def warm_up_pool():
+    for engine in {get_async_engine(), get_replica_async_engine()}:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
 
 
 def create_all_tables():
-    SQLModel.metadata.create_all(engine)
+    import app.models
+
+    SQLModel.metadata.create_all(get_engine())
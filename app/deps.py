@@ -1,37 +1,72 @@
 import os
-from collections.abc import Generator
+import secrets
+import time
+from collections.abc import AsyncGenerator
 from typing import Annotated
 
-import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.config.db import engine
-from app.models import Users
+from app.cache.user_principal_cache import user_principal_cache
+from app.config.db import (
+    READ_METHODS,
+    REPLICA_READ_YOUR_WRITES_SECONDS,
+    async_session_maker,
+    database_replica_url,
+    replica_session_maker,
+)
 from app.repository.user_repository import UserRepository
-from app.schemas import TokenPayload
+from app.schemas import TokenPayload, UserPrincipal
+from app.utils.http_utils import HttpUtils
+from app.utils.rate_limiter import rate_limiter
+from app.utils.security_utils import AuthUtils
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl="/login")
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
 
 
-def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+def create_session() -> AsyncSession:
+    return async_session_maker()
+
+
+def create_read_session(last_write_at: float | None) -> AsyncSession:
+    # a client that wrote within the window reads from the primary, since the
+    # replica may not have replayed its writes yet
+    if not database_replica_url or (
+        last_write_at is not None
+        and abs(time.time() - last_write_at) < REPLICA_READ_YOUR_WRITES_SECONDS
+    ):
+        return async_session_maker()
+
+    return replica_session_maker()
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    if request.method in READ_METHODS:
+        session = create_read_session(HttpUtils.get_last_write_at(request))
+    else:
+        session = create_session()
+
+    async with session:
         yield session
 
 
-SessionDep = Annotated[Session, Depends(get_db)]
+async def get_primary_db() -> AsyncGenerator[AsyncSession, None]:
+    async with create_session() as session:
+        yield session
+
+
+SessionDep = Annotated[AsyncSession, Depends(get_db)]
+PrimarySessionDep = Annotated[AsyncSession, Depends(get_primary_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> Users:
+async def get_current_user(token: TokenDep) -> UserPrincipal:
     try:
-        secret_key = os.getenv("JWT_SECRET_KEY")
-        algorithm = os.getenv("JWT_ALGORITHM")
-
-        payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+        payload = AuthUtils.decode_access_token(token)
         token_data = TokenPayload(**payload)
     except (InvalidTokenError, ValidationError):
         raise HTTPException(
@@ -39,8 +74,12 @@ def get_current_user(session: SessionDep, token: TokenDep) -> Users:
             detail="Could not validate credentials",
         )
 
-    user_repository = UserRepository(session)
-    user = user_repository.get_user_by_email(token_data.sub)
+    if token_data.uid is not None:
+        user = await user_principal_cache.get_or_load(
+            token_data.uid, lambda: load_user_principal_by_id(token_data.uid)
+        )
+    else:
+        user = await load_user_principal_by_email(token_data.sub)
 
     if not user:
         raise HTTPException(status_code=404, detail="Usuario não encontrado")
@@ -48,4 +87,40 @@ def get_current_user(session: SessionDep, token: TokenDep) -> Users:
     return user
 
 
-CurrentUser = Annotated[Users, Depends(get_current_user)]
+async def load_user_principal_by_id(user_id: int) -> UserPrincipal | None:
+    async with create_session() as session:
+        return await UserRepository(session).get_user_principal_by_id(user_id)
+
+
+async def load_user_principal_by_email(email: str) -> UserPrincipal | None:
+    async with create_session() as session:
+        return await UserRepository(session).get_user_principal_by_email(email)
+
+
+CurrentUser = Annotated[UserPrincipal, Depends(get_current_user)]
+
+
+def verify_admin_token(x_admin_token: Annotated[str | None, Header()] = None):
+    if not (
+        ADMIN_API_TOKEN
+        and x_admin_token
+        and secrets.compare_digest(x_admin_token, ADMIN_API_TOKEN)
+    ):
+        raise HTTPException(status_code=403, detail="Acesso negado")
+
+
+AdminDep = Depends(verify_admin_token)
+
+
+def limit_user_rate(cost: float):
+    async def check_user_rate(current_user: CurrentUser):
+        await rate_limiter.check(f"user:{current_user.id}", cost)
+
+    return Depends(check_user_rate)
+
+
+def limit_ip_rate(cost: float):
+    async def check_ip_rate(request: Request):
+        await rate_limiter.check(f"ip:{HttpUtils.get_client_ip(request)}", cost)
+
+    return Depends(check_ip_rate)
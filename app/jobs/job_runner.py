@@ -0,0 +1,71 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable, TypeVar
+
+from fastapi import HTTPException
+
+T = TypeVar("T")
+
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "2"))
+JOB_PROCESS_WORKERS = int(
+    os.getenv("JOB_PROCESS_WORKERS", str(min(2, os.cpu_count() or 1)))
+)
+
+
+class JobError(Exception):
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def _call_in_process(function: Callable[..., T], *args) -> T:
+    try:
+        return function(*args)
+    except HTTPException as exc:
+        # HTTPException can't be unpickled, so it would break the pool
+        raise JobError(exc.detail) from None
+
+
+class JobRunner:
+    def __init__(self, concurrency: int, process_workers: int):
+        self.concurrency = concurrency
+        self.process_workers = process_workers
+        self._slots = asyncio.Semaphore(concurrency)
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, job: Callable[[], Awaitable[None]]):
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: Callable[[], Awaitable[None]]):
+        async with self._slots:
+            await job()
+
+    async def run_in_process(self, function: Callable[..., T], *args) -> T:
+        if self._process_pool is None:
+            # spawn instead of fork: the parent has a running event loop and
+            # open database connections that must not leak into the workers
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self._process_pool, _call_in_process, function, *args
+        )
+
+    async def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self._process_pool is not None:
+            self._process_pool.shutdown(cancel_futures=True)
+            self._process_pool = None
+
+
+job_runner = JobRunner(JOB_CONCURRENCY, JOB_PROCESS_WORKERS)
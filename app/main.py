@@ -1,9 +1,35 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
-from app.routers import user_routes, login_routes, transaction_routes, tags_routes
+from app.config.db import DB_WARM_UP, warm_up_pool
+from app.jobs.job_runner import job_runner
+from app.middleware.read_your_writes_middleware import ReadYourWritesMiddleware
+from app.middleware.sql_metrics_middleware import SqlMetricsMiddleware
+from app.routers import (
+    admin_routes,
+    job_routes,
+    user_routes,
+    login_routes,
+    transaction_routes,
+    tags_routes,
+)
+from app.utils.http_utils import LAST_WRITE_HEADER
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DB_WARM_UP:
+        await warm_up_pool()
+    yield
+    await job_runner.shutdown()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(SqlMetricsMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,6 +37,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[LAST_WRITE_HEADER],
 )
 
 app.include_router(
@@ -33,6 +60,16 @@ app.include_router(
     prefix="/tags",
     tags=["tags"],
 )
+app.include_router(
+    job_routes.router,
+    prefix="/jobs",
+    tags=["jobs"],
+)
+app.include_router(
+    admin_routes.router,
+    prefix="/admin",
+    tags=["admin"],
+)
 
 
 @app.get("/")
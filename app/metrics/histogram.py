@@ -0,0 +1,33 @@
+import bisect
+import threading
+
+
+class Histogram:
+    def __init__(self, buckets: list[float]):
+        self.buckets = sorted(buckets)
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self._counts)
+            count = self._count
+            total = self._sum
+
+        return {
+            "buckets": [
+                {"le": le, "count": bucket_count}
+                for le, bucket_count in zip(self.buckets + [None], counts)
+            ],
+            "count": count,
+            "sum": total,
+        }
@@ -0,0 +1,78 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from app.metrics.histogram import Histogram
+
+POOL_WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: QueuePool | None = None
+        self.wait_ms = Histogram(POOL_WAIT_BUCKETS_MS)
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._max_checked_out = 0
+
+    def observe_checkout(self, wait_ms: float, checked_out: int):
+        self.wait_ms.observe(wait_ms)
+        with self._lock:
+            self._checkouts += 1
+            self._max_checked_out = max(self._max_checked_out, checked_out)
+
+    def observe_timeout(self, wait_ms: float):
+        self.wait_ms.observe(wait_ms)
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self):
+        pool = self.pool
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+
+        with self._lock:
+            checkouts = self._checkouts
+            timeouts = self._timeouts
+            max_checked_out = self._max_checked_out
+
+        return {
+            "name": self.name,
+            "size": pool.size(),
+            "maxOverflow": pool._max_overflow,
+            "checkedOut": checked_out,
+            "checkedIn": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "maxCheckedOut": max_checked_out,
+            "utilization": checked_out / capacity if capacity else 0.0,
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "waitMs": self.wait_ms.snapshot(),
+        }
+
+
+def create_timed_pool_class(pool_class: type[QueuePool], metrics: PoolMetrics):
+    class TimedPool(pool_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            metrics.pool = self
+
+        def _do_get(self):
+            started_at = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                metrics.observe_timeout((time.perf_counter() - started_at) * 1000)
+                raise
+
+            metrics.observe_checkout(
+                (time.perf_counter() - started_at) * 1000, self.checkedout()
+            )
+            return connection
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
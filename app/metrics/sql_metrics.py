@@ -0,0 +1,52 @@
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))
+
+
+@dataclass
+class RequestSqlStats:
+    statement_count: int = 0
+    db_time_ms: float = 0.0
+    statement_shapes: Counter = field(default_factory=Counter)
+
+    def observe(self, statement: str, elapsed_ms: float):
+        self.statement_count += 1
+        self.db_time_ms += elapsed_ms
+        self.statement_shapes[statement] += 1
+
+    def get_repeated_statements(self):
+        return [
+            {"statement": statement, "count": count}
+            for statement, count in self.statement_shapes.most_common()
+            if count >= SQL_N_PLUS_ONE_THRESHOLD
+        ]
+
+
+request_sql_stats: ContextVar[RequestSqlStats | None] = ContextVar(
+    "request_sql_stats", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_statement_timer(
+    connection, cursor, statement, parameters, context, executemany
+):
+    if context is not None:
+        context.sql_metrics_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_statement(connection, cursor, statement, parameters, context, executemany):
+    stats = request_sql_stats.get()
+    started_at = getattr(context, "sql_metrics_started_at", None)
+    if stats is None or started_at is None:
+        return
+
+    stats.observe(statement, (time.perf_counter() - started_at) * 1000)
@@ -0,0 +1,36 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.db import (
+    READ_METHODS,
+    REPLICA_READ_YOUR_WRITES_SECONDS,
+    database_replica_url,
+)
+from app.utils.http_utils import HttpUtils
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in READ_METHODS
+            or not database_replica_url
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_last_write(message: Message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                HttpUtils.set_last_write_at(
+                    MutableHeaders(scope=message),
+                    time.time(),
+                    REPLICA_READ_YOUR_WRITES_SECONDS,
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_last_write)
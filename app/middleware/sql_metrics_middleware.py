@@ -0,0 +1,68 @@
+import json
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics.sql_metrics import RequestSqlStats, request_sql_stats
+
+logger = logging.getLogger(__name__)
+
+LOGGED_STATEMENT_LENGTH = 200
+
+
+class SqlMetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSqlStats()
+        status_code = None
+
+        async def send_with_server_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.db_time_ms:.2f};desc="{stats.statement_count} queries"',
+                )
+            await send(message)
+
+        token = request_sql_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            request_sql_stats.reset(token)
+            self.log_request(scope, status_code, stats)
+
+    @staticmethod
+    def log_request(scope: Scope, status_code: int | None, stats: RequestSqlStats):
+        repeated_statements = [
+            {
+                "statement": repeated["statement"][:LOGGED_STATEMENT_LENGTH],
+                "count": repeated["count"],
+            }
+            for repeated in stats.get_repeated_statements()
+        ]
+        log_line = json.dumps(
+            {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "statements": stats.statement_count,
+                "dbTimeMs": round(stats.db_time_ms, 2),
+                "probableNPlusOne": repeated_statements,
+            },
+            ensure_ascii=False,
+        )
+
+        if repeated_statements:
+            logger.warning(log_line)
+        else:
+            logger.info(log_line)
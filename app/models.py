@@ -1,8 +1,91 @@
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
 from typing import List, Optional
 
+from sqlalchemy import (
+    DDL,
+    Column,
+    Computed,
+    Index,
+    Integer,
+    Text,
+    event,
+    literal_column,
+)
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel.sql.sqltypes import AutoString
+
+
+UNTAGGED_TAG_ID = 0
+
+# Kept in sync with the b57174dffbd5 migration so create_all() builds the
+# same search indexes as `alembic upgrade head`. The migration keeps its own
+# frozen copy on purpose, since migrations don't import app code. None of it
+# is in the metadata, so alembic/env.py skips these objects in autogenerate.
+TRANSACTION_SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE transaction_fts USING fts5("
+        "name, description, content='transaction', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER transaction_fts_ai AFTER INSERT ON "transaction" BEGIN '
+        "INSERT INTO transaction_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END",
+        'CREATE TRIGGER transaction_fts_ad AFTER DELETE ON "transaction" BEGIN '
+        "INSERT INTO transaction_fts(transaction_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); END",
+        "CREATE TRIGGER transaction_fts_au AFTER UPDATE OF name, description "
+        'ON "transaction" BEGIN '
+        "INSERT INTO transaction_fts(transaction_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO transaction_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END",
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        'CREATE INDEX ix_transaction_name_trgm ON "transaction" '
+        "USING gin (name gin_trgm_ops)",
+        'CREATE INDEX ix_transaction_description_trgm ON "transaction" '
+        "USING gin (description gin_trgm_ops)",
+    ],
+    "mysql": [
+        "CREATE FULLTEXT INDEX ix_transaction_name_description_fulltext "
+        "ON `transaction` (name, description)",
+    ],
+}
+TRANSACTION_SEARCH_INDEXES = {
+    "ix_transaction_name_trgm",
+    "ix_transaction_description_trgm",
+    "ix_transaction_name_description_fulltext",
+}
+
+
+class year_month_bucket(FunctionElement):
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(year_month_bucket)
+def compile_year_month_bucket(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return (
+        f"(CAST(EXTRACT(YEAR FROM {column}) AS INTEGER) * 100"
+        f" + CAST(EXTRACT(MONTH FROM {column}) AS INTEGER))"
+    )
+
+
+@compiles(year_month_bucket, "mysql")
+def compile_year_month_bucket_mysql(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return f"(YEAR({column}) * 100 + MONTH({column}))"
+
+
+@compiles(year_month_bucket, "sqlite")
+def compile_year_month_bucket_sqlite(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return f"CAST(strftime('%Y%m', {column}) AS INTEGER)"
 
 
 class Users(SQLModel, table=True):
@@ -23,15 +106,101 @@ class Tag(SQLModel, table=True):
 
 
 class Transaction(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_transaction_user_id_transaction_date", "user_id", "transaction_date"),
+        Index("ix_transaction_user_id_year_month", "user_id", "year_month"),
+        Index("ix_transaction_import_hash", "import_hash", unique=True),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     name: str
     description: str | None = None
     value: float
     transaction_date: date = Field(default_factory=lambda: date.today())
     type: TransactionType
+    year_month: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            Integer,
+            Computed(
+                year_month_bucket(literal_column("transaction_date")), persisted=True
+            ),
+        ),
+    )
+    import_hash: Optional[str] = Field(
+        default=None, max_length=64, sa_type=AutoString(length=64)
+    )
 
     tag_id: Optional[int] = Field(default=None, foreign_key="tag.id")
     tag: Tag = Relationship(back_populates=None)
 
     user_id: Optional[int] = Field(default=None, foreign_key="users.id")
     user: Users = Relationship(back_populates="transactions")
+
+
+class TransactionRollup(SQLModel, table=True):
+    __tablename__ = "transaction_rollup"
+
+    user_id: int = Field(foreign_key="users.id", primary_key=True)
+    year_month: int = Field(primary_key=True)
+    type: TransactionType = Field(primary_key=True)
+    tag_id: int = Field(default=UNTAGGED_TAG_ID, primary_key=True)
+    total_value: float = 0.0
+    transaction_count: int = 0
+
+
+class TransactionMonthVersion(SQLModel, table=True):
+    __tablename__ = "transaction_month_version"
+
+    user_id: int = Field(foreign_key="users.id", primary_key=True)
+    year_month: int = Field(primary_key=True)
+    version: int = 0
+
+
+class JobKind(str, Enum):
+    IMPORT_CSV = "IMPORT_CSV"
+    EXPORT_CSV = "EXPORT_CSV"
+
+
+class JobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class Job(SQLModel, table=True):
+    id: str = Field(primary_key=True, max_length=32, sa_type=AutoString(length=32))
+    user_id: int = Field(foreign_key="users.id", index=True)
+    kind: JobKind
+    status: JobStatus = JobStatus.PENDING
+    processed_rows: int = 0
+    result: Optional[str] = Field(
+        default=None, sa_column=Column(Text().with_variant(LONGTEXT(), "mysql"))
+    )
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+@event.listens_for(Transaction.__table__, "before_create")
+def set_year_month_persisted(table, connection, **kw):
+    # Same shape as the d39fdac79cdb migration: STORED, except on SQLite where
+    # ALTER TABLE can only add VIRTUAL generated columns
+    table.c.year_month.computed.persisted = (
+        None if connection.dialect.name == "sqlite" else True
+    )
+
+
+for dialect_name, statements in TRANSACTION_SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(
+            Transaction.__table__,
+            "after_create",
+            DDL(statement).execute_if(dialect=dialect_name),
+        )
+event.listen(
+    Transaction.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS transaction_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Job, JobKind
+
+
+class JobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_job(self, kind: JobKind, user_id: int):
+        job = Job(id=uuid.uuid4().hex, kind=kind, user_id=user_id)
+
+        self.session.add(job)
+        await self.session.commit()
+
+        return job
+
+    async def get_job_by_id(self, job_id: str):
+        search_job = select(Job).where(Job.id == job_id)
+        return (await self.session.exec(search_job)).first()
+
+    async def update_job(self, job_id: str, **values):
+        await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(**values, updated_at=datetime.utcnow())
+        )
+        await self.session.commit()
@@ -1,31 +1,61 @@
 from fastapi import HTTPException
+from sqlalchemy import event
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.cache.tag_cache import tag_cache
 from app.models import Tag
+from app.schemas import TagPublic
 
 
 class TagRepository:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def get_tag_by_id(self, tag_id: int):
-        search_tag = select(Tag).where(Tag.id == tag_id)
-        tag = self.session.exec(search_tag).first()
+    async def get_tag_by_id(self, tag_id: int):
+        tag = (await self._get_cached_tags()).tags_by_id.get(tag_id)
 
         if tag is None:
             raise HTTPException(status_code=404, detail="Tag not found")
 
         return tag
 
-    def get_tag_by_name(self, tag_name: str):
-        search_tag = select(Tag).where(Tag.name == tag_name)
-        tag = self.session.exec(search_tag).first()
+    async def get_tag_ids_by_name(self):
+        return {
+            tag_name: tag.id
+            for tag_name, tag in (await self._get_cached_tags()).tags_by_name.items()
+        }
 
-        if tag is None:
-            raise HTTPException(status_code=404, detail="Tag not found")
+    async def get_tag_ids(self):
+        return set((await self._get_cached_tags()).tags_by_id)
+
+    async def get_all_tags(self):
+        return (await self._get_cached_tags()).tags
+
+    async def get_tags_version(self):
+        return (await self._get_cached_tags()).version
+
+    async def _get_cached_tags(self):
+        return await tag_cache.get(self._load_tags)
+
+    async def _load_tags(self):
+        search_tag = select(Tag).order_by(Tag.id)
+        return [
+            TagPublic(id=tag.id, name=tag.name)
+            for tag in (await self.session.exec(search_tag)).all()
+        ]
+
+
+@event.listens_for(Session, "after_flush")
+def _track_tag_changes(session, flush_context):
+    if any(
+        isinstance(instance, Tag)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info["tags_changed"] = True
 
-        return tag
 
-    def get_all_tags(self):
-        search_tag = select(Tag)
-        return self.session.exec(search_tag).all()
+@event.listens_for(Session, "after_commit")
+def _invalidate_tag_cache(session):
+    if session.info.pop("tags_changed", False):
+        tag_cache.invalidate()
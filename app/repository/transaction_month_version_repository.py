@@ -0,0 +1,69 @@
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import TransactionMonthVersion
+
+VERSION_KEY_COLUMNS = ["user_id", "year_month"]
+
+
+class TransactionMonthVersionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def bump_versions(self, keys: set[tuple[int, int]]):
+        if not keys:
+            return
+
+        rows = [
+            {"user_id": user_id, "year_month": year_month, "version": 1}
+            for user_id, year_month in sorted(keys)
+        ]
+        table = TransactionMonthVersion.__table__
+        dialect_name = self.session.get_bind().dialect.name
+
+        if dialect_name in ("postgresql", "sqlite"):
+            dialect_insert = (
+                postgresql_insert if dialect_name == "postgresql" else sqlite_insert
+            )
+            upsert = dialect_insert(table).values(rows)
+            upsert = upsert.on_conflict_do_update(
+                index_elements=VERSION_KEY_COLUMNS,
+                set_={"version": table.c.version + 1},
+            )
+            await self.session.execute(upsert)
+            return
+
+        if dialect_name == "mysql":
+            upsert = mysql_insert(table).values(rows)
+            upsert = upsert.on_duplicate_key_update(version=table.c.version + 1)
+            await self.session.execute(upsert)
+            return
+
+        for row in rows:
+            updated = await self.session.execute(
+                update(table)
+                .where(table.c.user_id == row["user_id"])
+                .where(table.c.year_month == row["year_month"])
+                .values(version=table.c.version + 1)
+            )
+            if updated.rowcount == 0:
+                await self.session.execute(insert(table).values(row))
+
+    async def get_version(self, user_id: int, year_month: int):
+        search_version = (
+            select(TransactionMonthVersion.version)
+            .where(TransactionMonthVersion.user_id == user_id)
+            .where(TransactionMonthVersion.year_month == year_month)
+        )
+        return (await self.session.exec(search_version)).first() or 0
+
+    async def get_versions_total(self, user_id: int):
+        # every bump adds one, so the sum changes whenever any month does
+        search_total = select(
+            func.coalesce(func.sum(TransactionMonthVersion.version), 0)
+        ).where(TransactionMonthVersion.user_id == user_id)
+        return (await self.session.exec(search_total)).one()
@@ -1,92 +1,403 @@
+import re
 from datetime import date
 
-from sqlalchemy import func
-from sqlmodel import Session, select
+from sqlalchemy import and_, delete, insert, literal_column, or_, table, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models import Transaction
+from app.models import Tag, Transaction, Users
+from app.repository.transaction_month_version_repository import (
+    TransactionMonthVersionRepository,
+)
+from app.repository.transaction_rollup_repository import TransactionRollupRepository
 from app.schemas import (
+    TagRow,
     TransactionCreate,
-    TransactionMonthsWithTransactions,
+    TransactionRow,
+    TransactionSearchFilters,
     TransactionUpdate,
 )
+from app.utils.date_utils import DateUtils
+
+TRANSACTION_STREAM_BATCH_SIZE = 500
+TRANSACTION_INSERT_BATCH_SIZE = 1000
 
 
 class TransactionRepository:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
+        self.transaction_rollup_repository = TransactionRollupRepository(session)
+        self.transaction_month_version_repository = TransactionMonthVersionRepository(
+            session
+        )
 
-    def create_transaction(self, transaction: TransactionCreate, user_id: int):
+    async def create_transaction(self, transaction: TransactionCreate, user_id: int):
         db_transaction = Transaction.model_validate(
             transaction, update={"user_id": user_id}
         )
 
         self.session.add(db_transaction)
-        self.session.commit()
-        self.session.refresh(db_transaction)
+        await self.transaction_rollup_repository.add_transactions([db_transaction])
+        await self.transaction_month_version_repository.bump_versions(
+            self._get_month_keys([db_transaction])
+        )
+        await self.session.commit()
+        await self.session.refresh(db_transaction, ["tag"])
 
         return db_transaction
 
-    def update_transaction(self, transaction_to_update: Transaction):
+    async def update_transaction(self, transaction_to_update: Transaction):
+        month_keys = self._get_month_keys([transaction_to_update], previous=True)
+        await self.transaction_rollup_repository.update_transaction(
+            transaction_to_update
+        )
+        await self.transaction_month_version_repository.bump_versions(month_keys)
         self.session.add(transaction_to_update)
-        self.session.commit()
-        self.session.refresh(transaction_to_update)
+        await self.session.commit()
+        await self.session.refresh(transaction_to_update, ["tag"])
 
         return transaction_to_update
 
-    def create_transactions_from_csv(self, transactions: list[dict], user_id: int):
+    async def create_transactions(
+        self, transactions: list[TransactionCreate], user_id: int
+    ):
         db_transactions = [
             Transaction.model_validate(transaction, update={"user_id": user_id})
             for transaction in transactions
         ]
 
         self.session.add_all(db_transactions)
-        self.session.commit()
+        await self.session.flush()
+        await self.transaction_rollup_repository.add_transactions(db_transactions)
+        await self.transaction_month_version_repository.bump_versions(
+            self._get_month_keys(db_transactions)
+        )
+        await self.session.commit()
+
+        return db_transactions
+
+    async def update_transactions(self, transactions_to_update: list[Transaction]):
+        month_keys = self._get_month_keys(transactions_to_update, previous=True)
+        await self.transaction_rollup_repository.update_transactions(
+            transactions_to_update
+        )
+        await self.transaction_month_version_repository.bump_versions(month_keys)
+        await self.session.commit()
+
+        return transactions_to_update
 
-    def get_transactions_by_date_between(
+    async def create_transactions_batch(self, transactions: list[dict], user_id: int):
+        rows = [{**transaction, "user_id": user_id} for transaction in transactions]
+
+        created_rows = []
+        for start in range(0, len(rows), TRANSACTION_INSERT_BATCH_SIZE):
+            created_rows += await self._insert_skipping_duplicates(
+                rows[start : start + TRANSACTION_INSERT_BATCH_SIZE], user_id
+            )
+        await self.transaction_rollup_repository.add_transaction_rows(created_rows)
+        await self.transaction_month_version_repository.bump_versions(
+            {
+                (user_id, DateUtils.get_year_month_bucket(row["transaction_date"]))
+                for row in created_rows
+            }
+        )
+
+        return len(created_rows)
+
+    async def _insert_skipping_duplicates(self, rows: list[dict], user_id: int):
+        table = Transaction.__table__
+        dialect_name = self.session.get_bind().dialect.name
+
+        if dialect_name in ("postgresql", "sqlite"):
+            dialect_insert = (
+                postgresql_insert if dialect_name == "postgresql" else sqlite_insert
+            )
+            created_hashes = set(
+                await self.session.scalars(
+                    dialect_insert(table)
+                    .on_conflict_do_nothing(index_elements=["import_hash"])
+                    .returning(table.c.import_hash),
+                    rows,
+                )
+            )
+            return [row for row in rows if row["import_hash"] in created_hashes]
+
+        if dialect_name == "mysql":
+            # No RETURNING on MySQL: the rollups need to know which rows are
+            # new, so look the hashes up first. import_hash includes the user,
+            # so locking the user row makes a concurrent import of the same
+            # file wait for this one, and the locking read then sees its rows
+            await self.session.execute(
+                select(Users.id).where(Users.id == user_id).with_for_update()
+            )
+            existing_hashes = set(
+                await self.session.scalars(
+                    select(table.c.import_hash)
+                    .where(
+                        table.c.import_hash.in_([row["import_hash"] for row in rows])
+                    )
+                    .with_for_update(read=True)
+                )
+            )
+            rows = [row for row in rows if row["import_hash"] not in existing_hashes]
+            if rows:
+                await self.session.execute(insert(table), rows)
+            return rows
+
+        await self.session.execute(insert(table), rows)
+        return rows
+
+    async def get_transaction_rows_by_date_between(
         self, user_id: int, initial_date: date, end_date: date
     ):
         search_transactions = (
-            select(Transaction)
+            self._select_transaction_rows()
             .where(Transaction.transaction_date >= initial_date)
             .where(Transaction.transaction_date <= end_date)
             .where(Transaction.user_id == user_id)
         )
 
-        return self.session.exec(search_transactions).all()
+        return [
+            self._to_transaction_row(row)
+            for row in await self.session.exec(search_transactions)
+        ]
+
+    async def search_transaction_rows(
+        self,
+        user_id: int,
+        filters: TransactionSearchFilters,
+        after: tuple[date, int] | None,
+        limit: int,
+    ):
+        search_transactions = self._select_transaction_rows().where(
+            Transaction.user_id == user_id
+        )
+
+        if filters.from_date is not None:
+            search_transactions = search_transactions.where(
+                Transaction.transaction_date >= filters.from_date
+            )
+        if filters.to_date is not None:
+            search_transactions = search_transactions.where(
+                Transaction.transaction_date <= filters.to_date
+            )
+        if filters.tag_id is not None:
+            search_transactions = search_transactions.where(
+                Transaction.tag_id == filters.tag_id
+            )
+        if filters.type is not None:
+            search_transactions = search_transactions.where(
+                Transaction.type == filters.type
+            )
+        if filters.min_value is not None:
+            search_transactions = search_transactions.where(
+                Transaction.value >= filters.min_value
+            )
+        if filters.max_value is not None:
+            search_transactions = search_transactions.where(
+                Transaction.value <= filters.max_value
+            )
 
-    def get_transaction_by_id(self, transaction_id: int):
-        search_transaction = select(Transaction).where(Transaction.id == transaction_id)
-        return self.session.exec(search_transaction).first()
+        search_terms = re.findall(r"\w+", filters.query or "")
+        if search_terms:
+            search_transactions = search_transactions.where(
+                self._match_search_terms(search_terms)
+            )
 
-    def find_months_with_transactions(self, user_id: int):
         search_transactions = (
-            select(
-                func.extract("year", Transaction.transaction_date).label("year"),
-                func.extract("month", Transaction.transaction_date).label("month"),
+            self._after_cursor(search_transactions, after)
+            .order_by(Transaction.transaction_date, Transaction.id)
+            .limit(limit)
+        )
+
+        return [
+            self._to_transaction_row(row)
+            for row in await self.session.exec(search_transactions)
+        ]
+
+    def _match_search_terms(self, search_terms: list[str]):
+        dialect_name = self.session.get_bind().dialect.name
+
+        if dialect_name == "sqlite":
+            match_query = " ".join(f'"{term}"*' for term in search_terms)
+            return Transaction.id.in_(
+                select(literal_column("rowid"))
+                .select_from(table("transaction_fts"))
+                .where(literal_column("transaction_fts").op("MATCH")(match_query))
             )
-            .where(Transaction.transaction_date is not None)
-            .where(Transaction.user_id == user_id)
-            .group_by(
-                func.extract("year", Transaction.transaction_date),
-                func.extract("month", Transaction.transaction_date),
+
+        if dialect_name == "mysql":
+            return text(
+                "MATCH (`transaction`.name, `transaction`.description) "
+                "AGAINST (:match_query IN BOOLEAN MODE)"
+            ).bindparams(match_query=" ".join(f"+{term}*" for term in search_terms))
+
+        return and_(
+            *(
+                or_(
+                    Transaction.name.icontains(term, autoescape=True),
+                    Transaction.description.icontains(term, autoescape=True),
+                )
+                for term in search_terms
             )
-            .order_by(
-                func.extract("year", Transaction.transaction_date).asc(),
-                func.extract("month", Transaction.transaction_date).asc(),
+        )
+
+    @staticmethod
+    def _select_transaction_rows():
+        return select(
+            Transaction.id,
+            Transaction.name,
+            Transaction.description,
+            Transaction.value,
+            Transaction.transaction_date,
+            Transaction.type,
+            Tag.id.label("tag_id"),
+            Tag.name.label("tag_name"),
+        ).outerjoin(Tag, Transaction.tag_id == Tag.id)
+
+    @staticmethod
+    def _to_transaction_row(row):
+        return TransactionRow(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            value=row.value,
+            transaction_date=row.transaction_date,
+            type=row.type,
+            tag=(
+                TagRow(id=row.tag_id, name=row.tag_name)
+                if row.tag_id is not None
+                else None
+            ),
+        )
+
+    @staticmethod
+    def _after_cursor(search_transactions, after: tuple[date, int] | None):
+        if after is None:
+            return search_transactions
+
+        after_date, after_id = after
+        return search_transactions.where(
+            or_(
+                Transaction.transaction_date > after_date,
+                and_(
+                    Transaction.transaction_date == after_date,
+                    Transaction.id > after_id,
+                ),
             )
         )
 
-        search_transactions_result = self.session.execute(search_transactions)
-        transaction_months = [
-            TransactionMonthsWithTransactions(year=row.year, month=row.month)
-            for row in search_transactions_result
+    async def stream_transactions_by_date_between(
+        self,
+        user_id: int,
+        initial_date: date,
+        end_date: date,
+        after: tuple[date, int] | None = None,
+        limit: int | None = None,
+    ):
+        search_transactions = (
+            select(Transaction)
+            .options(joinedload(Transaction.tag))
+            .where(Transaction.user_id == user_id)
+            .where(Transaction.transaction_date >= initial_date)
+            .where(Transaction.transaction_date <= end_date)
+            .order_by(Transaction.transaction_date, Transaction.id)
+            .limit(limit)
+            .execution_options(yield_per=TRANSACTION_STREAM_BATCH_SIZE)
+        )
+
+        search_transactions = self._after_cursor(search_transactions, after)
+
+        async for transaction in await self.session.stream_scalars(search_transactions):
+            yield transaction
+
+    async def get_transaction_by_id(self, transaction_id: int):
+        search_transaction = (
+            select(Transaction)
+            .options(joinedload(Transaction.tag))
+            .where(Transaction.id == transaction_id)
+        )
+        return (await self.session.exec(search_transaction)).first()
+
+    async def get_transactions_by_ids(self, transaction_ids: list[int], user_id: int):
+        search_transactions = (
+            select(Transaction)
+            .where(Transaction.id.in_(transaction_ids))
+            .where(Transaction.user_id == user_id)
+        )
+        return (await self.session.exec(search_transactions)).all()
+
+    async def delete_transaction(self, transaction: Transaction):
+        await self.delete_transactions([transaction])
+
+    async def delete_transactions(self, transactions: list[Transaction]):
+        # a concurrent delete of the same rows may have won since they were
+        # loaded, so only the rows this statement removed leave the rollups
+        deleted_ids = await self._delete_returning_ids(
+            [transaction.id for transaction in transactions]
+        )
+        transactions = [
+            transaction for transaction in transactions if transaction.id in deleted_ids
         ]
 
-        return transaction_months
+        await self.transaction_rollup_repository.remove_transactions(transactions)
+        await self.transaction_month_version_repository.bump_versions(
+            self._get_month_keys(transactions)
+        )
+        await self.session.commit()
+
+    async def _delete_returning_ids(self, transaction_ids: list[int]):
+        dialect_name = self.session.get_bind().dialect.name
+
+        if dialect_name in ("postgresql", "sqlite"):
+            return set(
+                await self.session.scalars(
+                    delete(Transaction)
+                    .where(Transaction.id.in_(transaction_ids))
+                    .returning(Transaction.id)
+                )
+            )
+
+        # No RETURNING on MySQL: lock the rows first, so a concurrent delete
+        # waits for this one and then finds them gone
+        deleted_ids = set(
+            await self.session.scalars(
+                select(Transaction.id)
+                .where(Transaction.id.in_(transaction_ids))
+                .with_for_update()
+            )
+        )
+        if deleted_ids:
+            await self.session.execute(
+                delete(Transaction).where(Transaction.id.in_(deleted_ids))
+            )
+        return deleted_ids
 
-    def delete_transaction(self, transaction_id: int):
-        search_transaction = select(Transaction).where(Transaction.id == transaction_id)
-        transaction = self.session.exec(search_transaction).first()
+    @staticmethod
+    def _get_month_keys(transactions: list[Transaction], previous: bool = False):
+        month_keys = {
+            (
+                transaction.user_id,
+                DateUtils.get_year_month_bucket(transaction.transaction_date),
+            )
+            for transaction in transactions
+        }
+        if previous:
+            month_keys |= {
+                (
+                    TransactionRollupRepository.get_committed_value(
+                        transaction, "user_id"
+                    ),
+                    DateUtils.get_year_month_bucket(
+                        TransactionRollupRepository.get_committed_value(
+                            transaction, "transaction_date"
+                        )
+                    ),
+                )
+                for transaction in transactions
+            }
 
-        self.session.delete(transaction)
-        self.session.commit()
+        return month_keys
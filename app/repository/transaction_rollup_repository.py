@@ -0,0 +1,269 @@
+from datetime import date
+
+from sqlalchemy import delete, func, insert, inspect, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import UNTAGGED_TAG_ID, Tag, Transaction, TransactionRollup
+from app.schemas import TransactionMonthsWithTransactions
+from app.utils.date_utils import DateUtils
+
+ROLLUP_KEY_COLUMNS = ["user_id", "year_month", "type", "tag_id"]
+
+
+class TransactionRollupRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def get_rollup_key(
+        user_id: int, transaction_date: date, transaction_type, tag_id: int | None
+    ):
+        return (
+            user_id,
+            DateUtils.get_year_month_bucket(transaction_date),
+            transaction_type,
+            tag_id or UNTAGGED_TAG_ID,
+        )
+
+    async def add_transactions(self, transactions: list[Transaction], sign: int = 1):
+        deltas = {}
+        for transaction in transactions:
+            key = self.get_rollup_key(
+                transaction.user_id,
+                transaction.transaction_date,
+                transaction.type,
+                transaction.tag_id,
+            )
+            self._add_delta(deltas, key, sign * transaction.value, sign)
+
+        await self.apply_deltas(deltas)
+
+    async def remove_transactions(self, transactions: list[Transaction]):
+        await self.add_transactions(transactions, sign=-1)
+
+    async def add_transaction_rows(self, rows: list[dict]):
+        deltas = {}
+        for row in rows:
+            key = self.get_rollup_key(
+                row["user_id"], row["transaction_date"], row["type"], row["tag_id"]
+            )
+            self._add_delta(deltas, key, row["value"], 1)
+
+        await self.apply_deltas(deltas)
+
+    async def update_transaction(self, transaction: Transaction):
+        await self.update_transactions([transaction])
+
+    async def update_transactions(self, transactions: list[Transaction]):
+        deltas = {}
+        for transaction in transactions:
+            previous_key = self.get_rollup_key(
+                self.get_committed_value(transaction, "user_id"),
+                self.get_committed_value(transaction, "transaction_date"),
+                self.get_committed_value(transaction, "type"),
+                self.get_committed_value(transaction, "tag_id"),
+            )
+            current_key = self.get_rollup_key(
+                transaction.user_id,
+                transaction.transaction_date,
+                transaction.type,
+                transaction.tag_id,
+            )
+
+            self._add_delta(
+                deltas,
+                previous_key,
+                -self.get_committed_value(transaction, "value"),
+                -1,
+            )
+            self._add_delta(deltas, current_key, transaction.value, 1)
+
+        await self.apply_deltas(deltas)
+
+    async def apply_deltas(self, deltas: dict):
+        if not deltas:
+            return
+
+        rows = [
+            dict(
+                zip(ROLLUP_KEY_COLUMNS, key),
+                total_value=total_value,
+                transaction_count=transaction_count,
+            )
+            for key, (total_value, transaction_count) in deltas.items()
+        ]
+        table = TransactionRollup.__table__
+        dialect_name = self.session.get_bind().dialect.name
+
+        if dialect_name in ("postgresql", "sqlite"):
+            dialect_insert = (
+                postgresql_insert if dialect_name == "postgresql" else sqlite_insert
+            )
+            upsert = dialect_insert(table).values(rows)
+            upsert = upsert.on_conflict_do_update(
+                index_elements=ROLLUP_KEY_COLUMNS,
+                set_={
+                    "total_value": table.c.total_value + upsert.excluded.total_value,
+                    "transaction_count": table.c.transaction_count
+                    + upsert.excluded.transaction_count,
+                },
+            )
+            await self.session.execute(upsert)
+            return
+
+        if dialect_name == "mysql":
+            upsert = mysql_insert(table).values(rows)
+            upsert = upsert.on_duplicate_key_update(
+                total_value=table.c.total_value + upsert.inserted.total_value,
+                transaction_count=table.c.transaction_count
+                + upsert.inserted.transaction_count,
+            )
+            await self.session.execute(upsert)
+            return
+
+        for row in rows:
+            updated = await self.session.execute(
+                update(table)
+                .where(
+                    *(table.c[column] == row[column] for column in ROLLUP_KEY_COLUMNS)
+                )
+                .values(
+                    total_value=table.c.total_value + row["total_value"],
+                    transaction_count=table.c.transaction_count
+                    + row["transaction_count"],
+                )
+            )
+            if updated.rowcount == 0:
+                await self.session.execute(insert(table).values(row))
+
+    @staticmethod
+    def _add_delta(
+        deltas: dict, key: tuple, total_value: float, transaction_count: int
+    ):
+        previous_total_value, previous_transaction_count = deltas.get(key, (0.0, 0))
+        deltas[key] = (
+            previous_total_value + total_value,
+            previous_transaction_count + transaction_count,
+        )
+
+    @staticmethod
+    def get_committed_value(transaction: Transaction, attribute: str):
+        history = inspect(transaction).attrs[attribute].history
+        if history.deleted:
+            return history.deleted[0]
+
+        return getattr(transaction, attribute)
+
+    async def get_rollup_totals(
+        self, user_id: int, year_month: int, group_by_tag: bool = False
+    ):
+        return await self.get_rollup_series(
+            user_id, year_month, year_month, group_by_tag
+        )
+
+    async def get_rollup_series(
+        self,
+        user_id: int,
+        from_year_month: int,
+        to_year_month: int,
+        group_by_tag: bool = False,
+    ):
+        group_columns = [TransactionRollup.year_month, TransactionRollup.type]
+        if group_by_tag:
+            group_columns += [Tag.id.label("tag_id"), Tag.name.label("tag_name")]
+
+        search_totals = (
+            select(
+                *group_columns, func.sum(TransactionRollup.total_value).label("total")
+            )
+            .where(TransactionRollup.user_id == user_id)
+            .where(TransactionRollup.year_month >= from_year_month)
+            .where(TransactionRollup.year_month <= to_year_month)
+            .where(TransactionRollup.transaction_count > 0)
+            .group_by(*group_columns)
+            .order_by(TransactionRollup.year_month)
+        )
+
+        if group_by_tag:
+            search_totals = search_totals.outerjoin(
+                Tag, TransactionRollup.tag_id == Tag.id
+            ).order_by(Tag.id)
+
+        return (await self.session.exec(search_totals)).all()
+
+    async def find_months_with_transactions(self, user_id: int):
+        search_months = (
+            select(TransactionRollup.year_month)
+            .where(TransactionRollup.user_id == user_id)
+            .where(TransactionRollup.transaction_count > 0)
+            .group_by(TransactionRollup.year_month)
+            .order_by(TransactionRollup.year_month.asc())
+        )
+
+        return [
+            TransactionMonthsWithTransactions(
+                year=year_month // 100, month=year_month % 100
+            )
+            for year_month in await self.session.exec(search_months)
+        ]
+
+    async def get_rollups(self, user_id: int | None = None):
+        search_rollups = select(TransactionRollup).where(
+            TransactionRollup.transaction_count != 0
+        )
+        if user_id is not None:
+            search_rollups = search_rollups.where(TransactionRollup.user_id == user_id)
+
+        return {
+            (
+                rollup.user_id,
+                rollup.year_month,
+                rollup.type,
+                rollup.tag_id,
+            ): (rollup.total_value, rollup.transaction_count)
+            for rollup in await self.session.exec(search_rollups)
+        }
+
+    async def compute_rollups_from_transactions(self, user_id: int | None = None):
+        tag_id = func.coalesce(Transaction.tag_id, UNTAGGED_TAG_ID)
+        group_columns = [
+            Transaction.user_id,
+            Transaction.year_month,
+            Transaction.type,
+            tag_id,
+        ]
+        search_rollups = select(
+            *group_columns,
+            func.sum(Transaction.value),
+            func.count(Transaction.id),
+        ).group_by(*group_columns)
+        if user_id is not None:
+            search_rollups = search_rollups.where(Transaction.user_id == user_id)
+
+        return {
+            (row[0], row[1], row[2], row[3]): (row[4], row[5])
+            for row in await self.session.exec(search_rollups)
+        }
+
+    async def replace_rollups(self, rollups: dict, user_id: int | None = None):
+        delete_rollups = delete(TransactionRollup)
+        if user_id is not None:
+            delete_rollups = delete_rollups.where(TransactionRollup.user_id == user_id)
+        await self.session.execute(delete_rollups)
+
+        if rollups:
+            await self.session.execute(
+                insert(TransactionRollup),
+                [
+                    dict(
+                        zip(ROLLUP_KEY_COLUMNS, key),
+                        total_value=total_value,
+                        transaction_count=transaction_count,
+                    )
+                    for key, (total_value, transaction_count) in rollups.items()
+                ],
+            )
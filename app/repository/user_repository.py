@@ -1,25 +1,43 @@
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import Users
-from app.schemas import UserCreate
+from app.schemas import UserCreate, UserPrincipal
 from app.utils.security_utils import AuthUtils
 
 
 class UserRepository:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def get_user_by_email(self, email: str):
+    async def get_user_by_email(self, email: str):
         search_user = select(Users).where(Users.email == email)
-        return self.session.exec(search_user).first()
+        return (await self.session.exec(search_user)).first()
 
-    def create_user(self, user: UserCreate):
+    async def get_user_principal_by_id(self, user_id: int):
+        search_user = select(Users.id, Users.email).where(Users.id == user_id)
+        user = (await self.session.exec(search_user)).first()
+        return UserPrincipal(id=user.id, email=user.email) if user else None
+
+    async def get_user_principal_by_email(self, email: str):
+        search_user = select(Users.id, Users.email).where(Users.email == email)
+        user = (await self.session.exec(search_user)).first()
+        return UserPrincipal(id=user.id, email=user.email) if user else None
+
+    async def create_user(self, user: UserCreate):
         db_user = Users.model_validate(
-            user, update={"password": AuthUtils.get_password_hash(user.password)}
+            user,
+            update={"password": await AuthUtils.get_password_hash(user.password)},
         )
 
         self.session.add(db_user)
-        self.session.commit()
-        self.session.refresh(db_user)
+        await self.session.commit()
+        await self.session.refresh(db_user)
 
         return db_user
+
+    async def update_user_password(self, user: Users, password_hash: str):
+        user.password = password_hash
+
+        self.session.add(user)
+        await self.session.commit()
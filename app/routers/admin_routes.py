@@ -0,0 +1,19 @@
+from typing import List
+
+from fastapi import APIRouter
+
+from app.deps import AdminDep
+from app.schemas import PoolMetricsPublic
+from app.service.metrics_service import MetricsService
+
+router = APIRouter()
+
+
+@router.get(
+    "/pool-metrics",
+    tags=["admin"],
+    response_model=List[PoolMetricsPublic],
+    dependencies=[AdminDep],
+)
+async def get_pool_metrics_endpoint():
+    return MetricsService.get_pool_metrics()
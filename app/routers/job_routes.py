@@ -0,0 +1,47 @@
+from datetime import timezone
+
+from fastapi import APIRouter, Response
+
+from app.config.db import REPLICA_READ_YOUR_WRITES_SECONDS, database_replica_url
+from app.deps import PrimarySessionDep, CurrentUser
+from app.models import JobStatus
+from app.schemas import JobPublic
+from app.service.job_service import JobService
+from app.utils.http_utils import HttpUtils
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", tags=["jobs"], response_model=JobPublic)
+async def get_job_endpoint(
+    session: PrimarySessionDep,
+    current_user: CurrentUser,
+    job_id: str,
+    response: Response,
+):
+    job_service = JobService(session)
+    job = await job_service.get_job_public(job_id, current_user)
+
+    # the job wrote after its request returned, so the poll that sees it
+    # finish carries the write time for the reads that follow
+    if database_replica_url and job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+        HttpUtils.set_last_write_at(
+            response.headers,
+            job.updatedAt.replace(tzinfo=timezone.utc).timestamp(),
+            REPLICA_READ_YOUR_WRITES_SECONDS,
+        )
+
+    return job
+
+
+@router.get(
+    "/{job_id}/result",
+    tags=["jobs"],
+    responses={200: {"content": {"application/json": {}}}},
+)
+async def get_job_result_endpoint(
+    session: PrimarySessionDep, current_user: CurrentUser, job_id: str
+):
+    job_service = JobService(session)
+    result = await job_service.get_job_result(job_id, current_user)
+    return Response(content=result, media_type="application/json")
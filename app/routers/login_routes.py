@@ -1,13 +1,19 @@
 from fastapi import APIRouter
 
-from app.deps import SessionDep
+from app.deps import SessionDep, limit_ip_rate
 from app.schemas import Login, Token
 from app.service.login_service import LoginService
+from app.utils.rate_limiter import RateLimitCost
 
 router = APIRouter()
 
 
-@router.post("", tags=["login"], response_model=Token)
-def login(session: SessionDep, login_data: Login):
+@router.post(
+    "",
+    tags=["login"],
+    response_model=Token,
+    dependencies=[limit_ip_rate(RateLimitCost.LOGIN)],
+)
+async def login(session: SessionDep, login_data: Login):
     login_service = LoginService(session)
-    return login_service.login(login_data)
+    return await login_service.login(login_data)
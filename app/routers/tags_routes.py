@@ -1,15 +1,31 @@
 from typing import List
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
+from starlette import status
 
 from app.deps import SessionDep, CurrentUser
 from app.schemas import TagPublic
 from app.service.tag_service import TagService
+from app.utils.http_utils import HttpUtils
 
 router = APIRouter()
 
 
-@router.get("", tags=["tags"], response_model=List[TagPublic])
-def get_tags_endpoint(session: SessionDep, current_user: CurrentUser):
+@router.get(
+    "",
+    tags=["tags"],
+    response_model=List[TagPublic],
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
+)
+async def get_tags_endpoint(
+    session: SessionDep, current_user: CurrentUser, request: Request, response: Response
+):
     tag_service = TagService(session)
-    return tag_service.get_tags()
+    etag = await tag_service.get_tags_etag()
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if HttpUtils.etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    response.headers.update(cache_headers)
+    return await tag_service.get_tags()
@@ -1,103 +1,378 @@
-from typing import List
+from datetime import date
+from typing import List, Optional
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import (
+    APIRouter,
+    UploadFile,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import ORJSONResponse
 from starlette import status
+from starlette.responses import StreamingResponse
 
-from app.deps import SessionDep, CurrentUser
+from app.deps import SessionDep, CurrentUser, create_read_session, limit_user_rate
 from app.schemas import (
+    JobPublic,
+    TransactionBatchCreate,
+    TransactionBatchDelete,
+    TransactionBatchResult,
+    TransactionBatchUpdate,
     TransactionExportCsv,
     TransactionImportCsv,
+    TransactionImportCsvResult,
+    TransactionPage,
+    TransactionSearchFilters,
     TransactionPublic,
+    TransactionType,
     TransactionCreate,
     TransactionFormattedMonthsWithTransactions,
     TransactionSummary,
+    TransactionSummaryByTag,
+    TransactionSummarySeriesMonth,
     TransactionUpdate,
 )
+from app.service.job_service import JobService
 from app.service.transaction_service import TransactionService
+from app.utils.http_utils import HttpUtils
+from app.utils.rate_limiter import RateLimitCost
 
 router = APIRouter()
 
+TRANSACTION_PAGE_DEFAULT_LIMIT = 100
+TRANSACTION_PAGE_MAX_LIMIT = 500
+YEAR_MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
 
 @router.post(
     "", tags=["transactions"], response_model=TransactionPublic, status_code=201
 )
-def create_transaction_endpoint(
+async def create_transaction_endpoint(
     session: SessionDep, current_user: CurrentUser, transaction: TransactionCreate
 ):
     transaction_service = TransactionService(session)
-    return transaction_service.create_transaction(transaction, current_user)
+    return await transaction_service.create_transaction(transaction, current_user)
 
 
 @router.patch(
     "", tags=["transactions"], response_model=TransactionPublic, status_code=200
 )
-def update_transaction_endpoint(
+async def update_transaction_endpoint(
     session: SessionDep, current_user: CurrentUser, transaction: TransactionUpdate
 ):
     transaction_service = TransactionService(session)
-    return transaction_service.update_transaction(transaction, current_user)
+    return await transaction_service.update_transaction(transaction, current_user)
+
+
+@router.post("/batch", tags=["transactions"], response_model=TransactionBatchResult)
+async def create_transactions_batch_endpoint(
+    session: SessionDep, current_user: CurrentUser, batch: TransactionBatchCreate
+):
+    transaction_service = TransactionService(session)
+    return await transaction_service.create_transactions_batch(batch, current_user)
+
+
+@router.patch("/batch", tags=["transactions"], response_model=TransactionBatchResult)
+async def update_transactions_batch_endpoint(
+    session: SessionDep, current_user: CurrentUser, batch: TransactionBatchUpdate
+):
+    transaction_service = TransactionService(session)
+    return await transaction_service.update_transactions_batch(batch, current_user)
+
+
+@router.delete("/batch", tags=["transactions"], response_model=TransactionBatchResult)
+async def delete_transactions_batch_endpoint(
+    session: SessionDep, current_user: CurrentUser, batch: TransactionBatchDelete
+):
+    transaction_service = TransactionService(session)
+    return await transaction_service.delete_transactions_batch(batch, current_user)
 
 
-@router.post("/import-csv", tags=["transactions"], status_code=201)
-def create_transactions_from_csv(
+@router.post(
+    "/import-csv",
+    tags=["transactions"],
+    response_model=TransactionImportCsvResult,
+    status_code=201,
+    dependencies=[limit_user_rate(RateLimitCost.IMPORT_CSV)],
+)
+async def create_transactions_from_csv(
     session: SessionDep,
     current_user: CurrentUser,
     transaction_import_csv: TransactionImportCsv,
 ):
     transaction_service = TransactionService(session)
-    transaction_service.create_transactions_from_csv(
+    return await transaction_service.create_transactions_from_csv(
         transaction_import_csv, current_user
     )
 
 
-@router.get("", tags=["transactions"], response_model=List[TransactionPublic])
-def get_transactions_endpoint(
-    session: SessionDep, current_user: CurrentUser, year_month: str
+@router.post(
+    "/import-csv/jobs",
+    tags=["transactions"],
+    response_model=JobPublic,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[limit_user_rate(RateLimitCost.IMPORT_CSV)],
+)
+async def submit_import_csv_job_endpoint(
+    session: SessionDep,
+    current_user: CurrentUser,
+    transaction_import_csv: TransactionImportCsv,
+):
+    job_service = JobService(session)
+    return await job_service.submit_import_csv_job(transaction_import_csv, current_user)
+
+
+@router.post(
+    "/import-csv/upload",
+    tags=["transactions"],
+    response_model=TransactionImportCsvResult,
+    status_code=201,
+    dependencies=[limit_user_rate(RateLimitCost.IMPORT_CSV)],
+)
+async def import_transactions_csv_file(
+    session: SessionDep,
+    current_user: CurrentUser,
+    file: UploadFile = File(...),
+    bank_name: str = Form(...),
+    transactions_date: str = Form(pattern=YEAR_MONTH_PATTERN),
 ):
     transaction_service = TransactionService(session)
-    return transaction_service.get_transactions(year_month, current_user)
+    return await transaction_service.import_transactions_csv_file(
+        file.file, bank_name, transactions_date, current_user
+    )
+
+
+@router.get(
+    "",
+    tags=["transactions"],
+    response_model=List[TransactionPublic],
+    response_class=ORJSONResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
+)
+async def get_transactions_endpoint(
+    session: SessionDep, current_user: CurrentUser, request: Request, year_month: str
+):
+    transaction_service = TransactionService(session)
+    etag = await transaction_service.get_transactions_etag(year_month, current_user)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if HttpUtils.etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    return ORJSONResponse(
+        await transaction_service.get_transactions(year_month, current_user),
+        headers=cache_headers,
+    )
+
+
+@router.get("/range", tags=["transactions"], response_model=TransactionPage)
+async def get_transactions_page_endpoint(
+    session: SessionDep,
+    current_user: CurrentUser,
+    from_date: date = Query(alias="from"),
+    to_date: date = Query(alias="to"),
+    cursor: Optional[str] = None,
+    limit: int = Query(
+        default=TRANSACTION_PAGE_DEFAULT_LIMIT, ge=1, le=TRANSACTION_PAGE_MAX_LIMIT
+    ),
+):
+    transaction_service = TransactionService(session)
+    return await transaction_service.get_transactions_page(
+        from_date, to_date, cursor, limit, current_user
+    )
+
+
+@router.get(
+    "/search",
+    tags=["transactions"],
+    response_model=TransactionPage,
+    response_class=ORJSONResponse,
+)
+async def search_transactions_endpoint(
+    session: SessionDep,
+    current_user: CurrentUser,
+    q: Optional[str] = None,
+    tag_id: Optional[int] = None,
+    type: Optional[TransactionType] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    from_date: Optional[date] = Query(default=None, alias="from"),
+    to_date: Optional[date] = Query(default=None, alias="to"),
+    cursor: Optional[str] = None,
+    limit: int = Query(
+        default=TRANSACTION_PAGE_DEFAULT_LIMIT, ge=1, le=TRANSACTION_PAGE_MAX_LIMIT
+    ),
+):
+    transaction_service = TransactionService(session)
+    filters = TransactionSearchFilters(
+        query=q,
+        tag_id=tag_id,
+        type=type,
+        min_value=min_value,
+        max_value=max_value,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    return ORJSONResponse(
+        await transaction_service.search_transactions(
+            filters, cursor, limit, current_user
+        )
+    )
 
 
 @router.get(
     "/transaction-months",
     tags=["transactions"],
     response_model=List[TransactionFormattedMonthsWithTransactions],
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
 )
-def get_months_with_transactions_endpoint(
+async def get_months_with_transactions_endpoint(
     session: SessionDep,
     current_user: CurrentUser,
+    request: Request,
+    response: Response,
 ):
     transaction_service = TransactionService(session)
-    return transaction_service.get_months_with_transactions(current_user)
+    etag = await transaction_service.get_months_with_transactions_etag(current_user)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if HttpUtils.etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    response.headers.update(cache_headers)
+    return await transaction_service.get_months_with_transactions(current_user)
 
 
 @router.get(
     "/summary",
     tags=["transactions"],
     response_model=TransactionSummary,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
 )
-def get_transaction_summary_endpoint(
+async def get_transaction_summary_endpoint(
+    session: SessionDep,
+    current_user: CurrentUser,
+    request: Request,
+    response: Response,
+    year_month: str,
+):
+    transaction_service = TransactionService(session)
+    etag = await transaction_service.get_transaction_summary_etag(
+        year_month, current_user
+    )
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if HttpUtils.etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    response.headers.update(cache_headers)
+    return await transaction_service.get_transaction_summary(year_month, current_user)
+
+
+@router.get(
+    "/summary/by-tag",
+    tags=["transactions"],
+    response_model=TransactionSummaryByTag,
+)
+async def get_transaction_summary_by_tag_endpoint(
     session: SessionDep, current_user: CurrentUser, year_month: str
 ):
     transaction_service = TransactionService(session)
-    return transaction_service.get_transaction_summary(year_month, current_user)
+    return await transaction_service.get_transaction_summary_by_tag(
+        year_month, current_user
+    )
 
 
-@router.get("/export-csv", tags=["transactions"], response_model=TransactionExportCsv)
-def export_transactions_csv(
+@router.get(
+    "/summary/series",
+    tags=["transactions"],
+    response_model=List[TransactionSummarySeriesMonth],
+)
+async def get_transaction_summary_series_endpoint(
+    session: SessionDep,
+    current_user: CurrentUser,
+    from_year_month: str = Query(alias="from", pattern=YEAR_MONTH_PATTERN),
+    to_year_month: str = Query(alias="to", pattern=YEAR_MONTH_PATTERN),
+    by_tag: bool = False,
+):
+    transaction_service = TransactionService(session)
+    return await transaction_service.get_transaction_summary_series(
+        from_year_month, to_year_month, by_tag, current_user
+    )
+
+
+@router.get(
+    "/export-csv",
+    tags=["transactions"],
+    response_model=TransactionExportCsv,
+    dependencies=[limit_user_rate(RateLimitCost.EXPORT_CSV)],
+)
+async def export_transactions_csv(
     session: SessionDep, current_user: CurrentUser, year_month: str
 ):
     transaction_service = TransactionService(session)
-    return transaction_service.export_transactions_csv(year_month, current_user)
+    return await transaction_service.export_transactions_csv(year_month, current_user)
+
+
+@router.post(
+    "/export-csv/jobs",
+    tags=["transactions"],
+    response_model=JobPublic,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[limit_user_rate(RateLimitCost.EXPORT_CSV)],
+)
+async def submit_export_csv_job_endpoint(
+    session: SessionDep,
+    current_user: CurrentUser,
+    year_month: str = Query(pattern=YEAR_MONTH_PATTERN),
+):
+    job_service = JobService(session)
+    return await job_service.submit_export_csv_job(year_month, current_user)
+
+
+@router.get(
+    "/export-csv/stream",
+    tags=["transactions"],
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}}}},
+    dependencies=[limit_user_rate(RateLimitCost.EXPORT_CSV)],
+)
+async def export_transactions_csv_stream(
+    current_user: CurrentUser,
+    request: Request,
+    from_date: date = Query(alias="from"),
+    to_date: date = Query(alias="to"),
+):
+    TransactionService.validate_date_range(from_date, to_date)
+
+    async def csv_chunks():
+        async with create_read_session(HttpUtils.get_last_write_at(request)) as session:
+            transaction_service = TransactionService(session)
+            async for chunk in transaction_service.stream_transactions_csv(
+                from_date, to_date, current_user
+            ):
+                yield chunk
+
+    return StreamingResponse(
+        csv_chunks(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="transacoes_{from_date}_{to_date}.csv"'
+        },
+    )
 
 
 @router.delete(
     "/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["transactions"]
 )
-def delete_transaction_endpoint(
+async def delete_transaction_endpoint(
     session: SessionDep,
     current_user: CurrentUser,
     transaction_id: int,
 ):
     transaction_service = TransactionService(session)
-    transaction_service.delete_transaction(current_user, transaction_id)
+    await transaction_service.delete_transaction(current_user, transaction_id)
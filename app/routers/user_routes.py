@@ -1,13 +1,19 @@
 from fastapi import APIRouter
 
-from app.deps import SessionDep
+from app.deps import SessionDep, limit_ip_rate
 from app.schemas import UserCreate, UserPublic
 from app.service.user_service import UserService
+from app.utils.rate_limiter import RateLimitCost
 
 router = APIRouter()
 
 
-@router.post("", tags=["users"], response_model=UserPublic)
-def create_user_endpoint(session: SessionDep, user: UserCreate):
+@router.post(
+    "",
+    tags=["users"],
+    response_model=UserPublic,
+    dependencies=[limit_ip_rate(RateLimitCost.SIGN_UP)],
+)
+async def create_user_endpoint(session: SessionDep, user: UserCreate):
     user_service = UserService(session)
-    return user_service.create_user(user)
+    return await user_service.create_user(user)
@@ -1,8 +1,11 @@
+from dataclasses import dataclass
 from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
+
+TRANSACTION_BATCH_MAX_ITEMS = 500
 
 
 class Token(SQLModel):
@@ -11,6 +14,7 @@ class Token(SQLModel):
 
 class TokenPayload(SQLModel):
     sub: str | None = None
+    uid: int | None = None
 
 
 class Login(SQLModel):
@@ -28,6 +32,11 @@ class UserPublic(SQLModel):
     email: str
 
 
+class UserPrincipal(SQLModel):
+    id: int
+    email: str
+
+
 class TagPublic(SQLModel):
     id: int
     name: str
@@ -64,12 +73,47 @@ class TransactionUpdate(SQLModel):
     tag_id: Optional[int] = None
 
 
+class TransactionBatchCreate(SQLModel):
+    items: List[TransactionCreate] = Field(
+        min_length=1, max_length=TRANSACTION_BATCH_MAX_ITEMS
+    )
+
+
+class TransactionBatchUpdate(SQLModel):
+    items: List[TransactionUpdate] = Field(
+        min_length=1, max_length=TRANSACTION_BATCH_MAX_ITEMS
+    )
+
+
+class TransactionBatchDelete(SQLModel):
+    ids: List[int] = Field(min_length=1, max_length=TRANSACTION_BATCH_MAX_ITEMS)
+
+
+class TransactionBatchItemResult(SQLModel):
+    index: int
+    id: Optional[int] = None
+    status: int
+    detail: Optional[str] = None
+
+
+class TransactionBatchResult(SQLModel):
+    results: List[TransactionBatchItemResult]
+
+
 class TransactionImportCsv(SQLModel):
     bank_name: str
     transactions_date: str
     csv_base64: str
 
 
+class TransactionImportCsvResult(SQLModel):
+    acceptedRows: int
+    skippedRows: int
+    duplicateRows: int
+    elapsedSeconds: float
+    rowsPerSecond: float
+
+
 class TransactionExportCsv(SQLModel):
     base_64: str
 
@@ -84,6 +128,38 @@ class TransactionPublic(SQLModel):
     tag: Optional[TagPublic] = None
 
 
+@dataclass(slots=True)
+class TagRow:
+    id: int
+    name: str
+
+
+@dataclass(slots=True)
+class TransactionRow:
+    id: int
+    name: str
+    description: Optional[str]
+    value: float
+    transaction_date: Optional[date]
+    type: TransactionType
+    tag: Optional[TagRow]
+
+
+class TransactionSearchFilters(SQLModel):
+    query: Optional[str] = None
+    tag_id: Optional[int] = None
+    type: Optional[TransactionType] = None
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
+
+
+class TransactionPage(SQLModel):
+    items: List[TransactionPublic]
+    nextCursor: Optional[str] = None
+
+
 class TransactionMonthsWithTransactions(SQLModel):
     year: int
     month: int
@@ -101,3 +177,73 @@ class TransactionSummary(SQLModel):
     totalOutcome: float
     totalIncome: float
     profit: float
+
+
+class TransactionTagSummary(SQLModel):
+    tag: Optional[TagPublic] = None
+    totalOutcome: float
+    totalIncome: float
+    profit: float
+
+
+class TransactionSummaryByTag(SQLModel):
+    formattedDate: str
+    initialDate: date
+    lastDate: date
+    tags: List[TransactionTagSummary]
+
+
+class TransactionSummarySeriesMonth(SQLModel):
+    date: str
+    formattedDate: str
+    totalOutcome: float
+    totalIncome: float
+    profit: float
+    tags: Optional[List[TransactionTagSummary]] = None
+
+
+class JobKind(str, Enum):
+    IMPORT_CSV = "IMPORT_CSV"
+    EXPORT_CSV = "EXPORT_CSV"
+
+
+class JobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class JobPublic(SQLModel):
+    id: str
+    kind: JobKind
+    status: JobStatus
+    processedRows: int
+    error: Optional[str] = None
+    createdAt: datetime
+    updatedAt: datetime
+
+
+class HistogramBucket(SQLModel):
+    le: Optional[float] = None
+    count: int
+
+
+class Histogram(SQLModel):
+    buckets: List[HistogramBucket]
+    count: int
+    sum: float
+
+
+class PoolMetricsPublic(SQLModel):
+    name: str
+    size: int
+    maxOverflow: int
+    checkedOut: int
+    checkedIn: int
+    overflow: int
+    maxCheckedOut: int
+    utilization: float
+    checkouts: int
+    timeouts: int
+    waitMs: Histogram
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config.db import async_session_maker
+from app.jobs.job_runner import JobError, job_runner
+from app.models import Job, JobKind, JobStatus
+from app.repository.job_repository import JobRepository
+from app.schemas import JobPublic, TransactionImportCsv, UserPrincipal
+from app.service.transaction_service import TransactionService
+
+logger = logging.getLogger(__name__)
+
+# A job that hasn't reported progress for this long belongs to a worker that
+# died without marking it failed
+JOB_STALE_AFTER = timedelta(minutes=30)
+
+
+class JobService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.job_repository = JobRepository(session)
+
+    async def submit_import_csv_job(
+        self, transaction_import_csv: TransactionImportCsv, current_user: UserPrincipal
+    ):
+        async def import_csv(transaction_service: TransactionService, on_progress):
+            return await transaction_service.create_transactions_from_csv(
+                transaction_import_csv,
+                current_user,
+                run_parser=job_runner.run_in_process,
+                on_progress=on_progress,
+            )
+
+        return await self._submit_job(JobKind.IMPORT_CSV, import_csv, current_user)
+
+    async def submit_export_csv_job(self, year_month: str, current_user: UserPrincipal):
+        async def export_csv(transaction_service: TransactionService, on_progress):
+            return await transaction_service.export_transactions_csv(
+                year_month, current_user, on_progress=on_progress
+            )
+
+        return await self._submit_job(JobKind.EXPORT_CSV, export_csv, current_user)
+
+    async def get_job(self, job_id: str, current_user: UserPrincipal):
+        job = await self.job_repository.get_job_by_id(job_id)
+
+        if not job or job.user_id != current_user.id:
+            raise HTTPException(status_code=404, detail="Job not found!")
+
+        if (
+            job.status in (JobStatus.PENDING, JobStatus.RUNNING)
+            and job.updated_at < datetime.utcnow() - JOB_STALE_AFTER
+        ):
+            await self.job_repository.update_job(
+                job.id, status=JobStatus.FAILED, error="Job interrompido"
+            )
+            job = await self.job_repository.get_job_by_id(job_id)
+
+        return job
+
+    async def get_job_public(self, job_id: str, current_user: UserPrincipal):
+        return self.to_job_public(await self.get_job(job_id, current_user))
+
+    async def get_job_result(self, job_id: str, current_user: UserPrincipal):
+        job = await self.get_job(job_id, current_user)
+
+        if job.status != JobStatus.SUCCEEDED:
+            raise HTTPException(status_code=409, detail="Job ainda não finalizado")
+
+        return job.result
+
+    async def _submit_job(self, kind: JobKind, work, current_user: UserPrincipal):
+        job = await self.job_repository.create_job(kind, current_user.id)
+        job_runner.submit(lambda: self.run_job(job.id, work))
+
+        return self.to_job_public(job)
+
+    @staticmethod
+    async def run_job(job_id: str, work):
+        async with async_session_maker() as session:
+            job_repository = JobRepository(session)
+            await job_repository.update_job(job_id, status=JobStatus.RUNNING)
+
+            async def on_progress(processed_rows: int):
+                await job_repository.update_job(job_id, processed_rows=processed_rows)
+
+            try:
+                result = await work(TransactionService(session), on_progress)
+            except (HTTPException, JobError) as exc:
+                await JobService._fail_job(session, job_id, exc.detail)
+                return
+            except asyncio.CancelledError:
+                await JobService._fail_job(session, job_id, "Job interrompido")
+                raise
+            except Exception:
+                logger.exception("job %s failed", job_id)
+                await JobService._fail_job(
+                    session, job_id, "Erro inesperado ao processar o job"
+                )
+                return
+
+            await job_repository.update_job(
+                job_id,
+                status=JobStatus.SUCCEEDED,
+                result=json.dumps(jsonable_encoder(result)),
+            )
+
+    @staticmethod
+    async def _fail_job(session: AsyncSession, job_id: str, error: str):
+        await session.rollback()
+        await JobRepository(session).update_job(
+            job_id, status=JobStatus.FAILED, error=error
+        )
+
+    @staticmethod
+    def to_job_public(job: Job):
+        return JobPublic(
+            id=job.id,
+            kind=job.kind,
+            status=job.status,
+            processedRows=job.processed_rows,
+            error=job.error,
+            createdAt=job.created_at,
+            updatedAt=job.updated_at,
+        )
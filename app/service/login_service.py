@@ -1,5 +1,5 @@
 from fastapi import HTTPException
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.repository.user_repository import UserRepository
 from app.schemas import Login, Token
@@ -7,18 +7,26 @@ from app.utils.security_utils import AuthUtils
 
 
 class LoginService:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
         self.user_repository = UserRepository(session)
 
-    def login(self, login_data: Login):
-        user = self.user_repository.get_user_by_email(login_data.email)
+    async def login(self, login_data: Login):
+        user = await self.user_repository.get_user_by_email(login_data.email)
 
         if not user:
             raise HTTPException(status_code=401, detail="Email ou senha inválidos")
 
-        AuthUtils.verify_password(login_data.password, user.password)
+        if not await AuthUtils.verify_password(login_data.password, user.password):
+            raise HTTPException(status_code=401, detail="Email ou senha inválidos")
+
+        if AuthUtils.password_needs_rehash(user.password):
+            await self.user_repository.update_user_password(
+                user, await AuthUtils.get_password_hash(login_data.password)
+            )
 
-        access_token = AuthUtils.create_access_token(data={"sub": user.email})
+        access_token = AuthUtils.create_access_token(
+            data={"sub": user.email, "uid": user.id}
+        )
 
         return Token(access_token=access_token)
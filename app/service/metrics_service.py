@@ -0,0 +1,7 @@
+from app.config.db import pool_metrics
+
+
+class MetricsService:
+    @staticmethod
+    def get_pool_metrics():
+        return [metrics.snapshot() for metrics in pool_metrics if metrics.pool]
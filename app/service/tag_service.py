@@ -1,12 +1,15 @@
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.repository.tag_repository import TagRepository
 
 
 class TagService:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
         self.tag_repository = TagRepository(session)
 
-    def get_tags(self):
-        return self.tag_repository.get_all_tags()
+    async def get_tags(self):
+        return await self.tag_repository.get_all_tags()
+
+    async def get_tags_etag(self):
+        return f'"tags-{await self.tag_repository.get_tags_version()}"'
@@ -0,0 +1,62 @@
+import math
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.repository.transaction_month_version_repository import (
+    TransactionMonthVersionRepository,
+)
+from app.repository.transaction_rollup_repository import TransactionRollupRepository
+
+
+class TransactionRollupService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.transaction_rollup_repository = TransactionRollupRepository(session)
+        self.transaction_month_version_repository = TransactionMonthVersionRepository(
+            session
+        )
+
+    async def verify_rollups(self, user_id: int | None = None):
+        stored_rollups = await self.transaction_rollup_repository.get_rollups(user_id)
+        expected_rollups = (
+            await self.transaction_rollup_repository.compute_rollups_from_transactions(
+                user_id
+            )
+        )
+
+        drifted_rollups = []
+        for key in sorted(
+            stored_rollups.keys() | expected_rollups.keys(), key=lambda key: key[:2]
+        ):
+            stored_value, stored_count = stored_rollups.get(key, (0.0, 0))
+            expected_value, expected_count = expected_rollups.get(key, (0.0, 0))
+
+            if stored_count != expected_count or not math.isclose(
+                stored_value, expected_value, abs_tol=0.005
+            ):
+                drifted_rollups.append(
+                    {
+                        "key": key,
+                        "stored": (stored_value, stored_count),
+                        "expected": (expected_value, expected_count),
+                    }
+                )
+
+        return drifted_rollups
+
+    async def rebuild_rollups(self, user_id: int | None = None):
+        stored_rollups = await self.transaction_rollup_repository.get_rollups(user_id)
+        rollups = (
+            await self.transaction_rollup_repository.compute_rollups_from_transactions(
+                user_id
+            )
+        )
+        await self.transaction_rollup_repository.replace_rollups(rollups, user_id)
+        # summaries served from the replaced rollups may change, so their
+        # cached ETags must not validate anymore
+        await self.transaction_month_version_repository.bump_versions(
+            {key[:2] for key in stored_rollups.keys() | rollups.keys()}
+        )
+        await self.session.commit()
+
+        return len(rollups)
@@ -1,59 +1,96 @@
 import base64
 import csv
-from datetime import datetime
-from io import StringIO
+import time
+from collections import Counter
+from datetime import date, datetime
+from io import BytesIO, StringIO
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, BinaryIO, Callable
 
-import pandas as pd
 from fastapi import HTTPException
-from sqlmodel import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models import Users
 from app.repository.tag_repository import TagRepository
+from app.repository.transaction_month_version_repository import (
+    TransactionMonthVersionRepository,
+)
 from app.repository.transaction_repository import TransactionRepository
+from app.repository.transaction_rollup_repository import TransactionRollupRepository
 from app.schemas import (
+    TagPublic,
+    TransactionBatchCreate,
+    TransactionBatchDelete,
+    TransactionBatchItemResult,
+    TransactionBatchResult,
+    TransactionBatchUpdate,
     TransactionCreate,
     TransactionFormattedMonthsWithTransactions,
     TransactionImportCsv,
+    TransactionImportCsvResult,
+    TransactionSearchFilters,
     TransactionType,
     TransactionSummary,
+    TransactionSummaryByTag,
+    TransactionSummarySeriesMonth,
+    TransactionTagSummary,
     TransactionUpdate,
+    UserPrincipal,
 )
+from app.utils.cursor_utils import CursorUtils
 from app.utils.date_utils import DateUtils
+from app.utils.import_hash_utils import ImportHashUtils
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 EXPORT_CSV_HEADER = ["Nome", "Valor", "Descricao", "Data", "Tipo", "Categoria"]
+EXPORT_CSV_CHUNK_SIZE = 500
+IMPORT_CSV_CHUNK_SIZE = 1000
+SUMMARY_SERIES_MAX_MONTHS = 120
+NUBANK_CSV_REQUIRED_COLUMNS = {"title", "amount"}
+
+ProgressCallback = Callable[[int], Awaitable[None]]
 
 
-def get_tag_name_by_nubank_category_name(nubank_category_name):
-    category_map = {
-        "supermercado": "Mercado",
-        "restaurante": "Restaurante",
-        "casa": "Casa",
-        "saúde": "Academia e Saúde",
-        "transporte": "Transporte",
-        "lazer": "Lazer e Entretenimento",
-    }
-    return category_map.get(nubank_category_name, "Outros")
+NUBANK_CATEGORY_TAG_NAMES = {
+    "supermercado": "Mercado",
+    "restaurante": "Restaurante",
+    "casa": "Casa",
+    "saúde": "Academia e Saúde",
+    "transporte": "Transporte",
+    "lazer": "Lazer e Entretenimento",
+}
 
 
 class TransactionService:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
         self.transaction_repository = TransactionRepository(session)
         self.tag_repository = TagRepository(session)
+        self.transaction_rollup_repository = TransactionRollupRepository(session)
+        self.transaction_month_version_repository = TransactionMonthVersionRepository(
+            session
+        )
 
-    def create_transaction(self, transaction: TransactionCreate, current_user: Users):
+    async def create_transaction(
+        self, transaction: TransactionCreate, current_user: UserPrincipal
+    ):
         if transaction.tag_id:
-            self.tag_repository.get_tag_by_id(transaction.tag_id)
+            await self.tag_repository.get_tag_by_id(transaction.tag_id)
 
-        return self.transaction_repository.create_transaction(
+        return await self.transaction_repository.create_transaction(
             transaction, current_user.id
         )
 
-    def update_transaction(self, transaction: TransactionUpdate, current_user: Users):
-        transaction_to_update = self.get_transaction_by_id(transaction.id, current_user)
+    async def update_transaction(
+        self, transaction: TransactionUpdate, current_user: UserPrincipal
+    ):
+        transaction_to_update = await self.get_transaction_by_id(
+            transaction.id, current_user
+        )
 
         if transaction.tag_id:
-            self.tag_repository.get_tag_by_id(transaction.tag_id)
+            await self.tag_repository.get_tag_by_id(transaction.tag_id)
 
         transaction_to_update.name = transaction.name
         transaction_to_update.description = transaction.description
@@ -62,91 +99,495 @@ class TransactionService:
         transaction_to_update.type = transaction.type
         transaction_to_update.tag_id = transaction.tag_id
 
-        return self.transaction_repository.update_transaction(transaction_to_update)
+        return await self.transaction_repository.update_transaction(
+            transaction_to_update
+        )
+
+    async def create_transactions_batch(
+        self, batch: TransactionBatchCreate, current_user: UserPrincipal
+    ):
+        tag_ids = await self.tag_repository.get_tag_ids()
+
+        results = {}
+        valid_items = []
+        for index, transaction in enumerate(batch.items):
+            if transaction.tag_id and transaction.tag_id not in tag_ids:
+                results[index] = TransactionBatchItemResult(
+                    index=index, status=404, detail="Tag not found"
+                )
+                continue
+
+            valid_items.append((index, transaction))
+
+        if valid_items:
+            created_transactions = (
+                await self.transaction_repository.create_transactions(
+                    [transaction for _, transaction in valid_items], current_user.id
+                )
+            )
+            for (index, _), created_transaction in zip(
+                valid_items, created_transactions
+            ):
+                results[index] = TransactionBatchItemResult(
+                    index=index, id=created_transaction.id, status=201
+                )
+
+        return TransactionBatchResult(
+            results=[results[index] for index in range(len(batch.items))]
+        )
+
+    async def update_transactions_batch(
+        self, batch: TransactionBatchUpdate, current_user: UserPrincipal
+    ):
+        tag_ids = await self.tag_repository.get_tag_ids()
+        transactions_by_id, results = await self._get_batch_transactions(
+            [transaction.id for transaction in batch.items], current_user
+        )
+
+        transactions_to_update = []
+        for index, transaction in enumerate(batch.items):
+            if index in results:
+                continue
+
+            if transaction.tag_id and transaction.tag_id not in tag_ids:
+                results[index] = TransactionBatchItemResult(
+                    index=index, id=transaction.id, status=404, detail="Tag not found"
+                )
+                continue
+
+            transaction_to_update = transactions_by_id[transaction.id]
+            transaction_to_update.name = transaction.name
+            transaction_to_update.description = transaction.description
+            transaction_to_update.value = transaction.value
+            transaction_to_update.transaction_date = transaction.transaction_date
+            transaction_to_update.type = transaction.type
+            transaction_to_update.tag_id = transaction.tag_id
+            transactions_to_update.append(transaction_to_update)
+
+            results[index] = TransactionBatchItemResult(
+                index=index, id=transaction.id, status=200
+            )
+
+        if transactions_to_update:
+            await self.transaction_repository.update_transactions(
+                transactions_to_update
+            )
+
+        return TransactionBatchResult(
+            results=[results[index] for index in range(len(batch.items))]
+        )
+
+    async def delete_transactions_batch(
+        self, batch: TransactionBatchDelete, current_user: UserPrincipal
+    ):
+        transactions_by_id, results = await self._get_batch_transactions(
+            batch.ids, current_user
+        )
+
+        transactions_to_delete = []
+        for index, transaction_id in enumerate(batch.ids):
+            if index in results:
+                continue
+
+            transactions_to_delete.append(transactions_by_id[transaction_id])
+            results[index] = TransactionBatchItemResult(
+                index=index, id=transaction_id, status=204
+            )
+
+        if transactions_to_delete:
+            await self.transaction_repository.delete_transactions(
+                transactions_to_delete
+            )
+
+        return TransactionBatchResult(
+            results=[results[index] for index in range(len(batch.ids))]
+        )
 
-    def create_transactions_from_csv(
+    async def _get_batch_transactions(
+        self, transaction_ids: list[int], current_user: UserPrincipal
+    ):
+        transactions_by_id = {
+            transaction.id: transaction
+            for transaction in await self.transaction_repository.get_transactions_by_ids(
+                list(set(transaction_ids)), current_user.id
+            )
+        }
+
+        results = {}
+        seen_ids = set()
+        for index, transaction_id in enumerate(transaction_ids):
+            if transaction_id in seen_ids:
+                results[index] = TransactionBatchItemResult(
+                    index=index,
+                    id=transaction_id,
+                    status=409,
+                    detail="Transação repetida no lote",
+                )
+            elif transaction_id not in transactions_by_id:
+                results[index] = TransactionBatchItemResult(
+                    index=index,
+                    id=transaction_id,
+                    status=404,
+                    detail="Transaction not found!",
+                )
+            seen_ids.add(transaction_id)
+
+        return transactions_by_id, results
+
+    async def create_transactions_from_csv(
         self,
         transaction_import_csv: TransactionImportCsv,
-        current_user: Users,
+        current_user: UserPrincipal,
+        run_parser: Callable[..., Awaitable] = run_in_threadpool,
+        on_progress: ProgressCallback | None = None,
     ):
-        transaction_to_create = []
-
+        started_at = time.perf_counter()
         transaction_date = datetime.strptime(
             transaction_import_csv.transactions_date, "%Y-%m"
         )
+        tag_ids_by_name = await self.tag_repository.get_tag_ids_by_name()
+
+        async def parsed_chunks():
+            for parsed_chunk in await run_parser(
+                parse_nubank_csv,
+                base64.b64decode(transaction_import_csv.csv_base64),
+                transaction_import_csv.bank_name,
+                transaction_date,
+                tag_ids_by_name,
+                current_user.id,
+            ):
+                yield parsed_chunk
+
+        return await self._create_transactions_from_parsed_chunks(
+            parsed_chunks(), current_user, started_at, on_progress
+        )
+
+    async def import_transactions_csv_file(
+        self,
+        csv_file: BinaryIO,
+        bank_name: str,
+        transactions_date: str,
+        current_user: UserPrincipal,
+    ):
+        import pandas as pd
 
-        decoded_csv = base64.b64decode(transaction_import_csv.csv_base64).decode(
-            "utf-8"
+        started_at = time.perf_counter()
+        transaction_date = datetime.strptime(transactions_date, "%Y-%m")
+        tag_ids_by_name = await self.tag_repository.get_tag_ids_by_name()
+
+        async def parsed_chunks():
+            occurrences = Counter()
+            chunks = await run_in_threadpool(
+                pd.read_csv, csv_file, chunksize=IMPORT_CSV_CHUNK_SIZE
+            )
+            while (df := await run_in_threadpool(next, chunks, None)) is not None:
+                yield await run_in_threadpool(
+                    self._get_transactions_from_nubank_csv,
+                    df,
+                    bank_name,
+                    transaction_date,
+                    tag_ids_by_name,
+                    current_user.id,
+                    occurrences,
+                )
+
+        return await self._create_transactions_from_parsed_chunks(
+            parsed_chunks(), current_user, started_at
         )
-        df = pd.read_csv(StringIO(decoded_csv))
 
-        for index, row in df.iterrows():
-            category = row.get("category", None)
-            if row["amount"] < 0:
-                continue
+    async def _create_transactions_from_parsed_chunks(
+        self,
+        parsed_chunks: AsyncIterator[tuple[list[dict], int]],
+        current_user: UserPrincipal,
+        started_at: float,
+        on_progress: ProgressCallback | None = None,
+    ):
+        import pandas as pd
+
+        accepted_rows = 0
+        skipped_rows = 0
+        duplicate_rows = 0
+        try:
+            async for transaction_to_create, chunk_skipped_rows in parsed_chunks:
+                created_rows = (
+                    await self.transaction_repository.create_transactions_batch(
+                        transaction_to_create, current_user.id
+                    )
+                )
+
+                accepted_rows += created_rows
+                skipped_rows += chunk_skipped_rows
+                duplicate_rows += len(transaction_to_create) - created_rows
+
+                if on_progress is not None:
+                    # chunks are committed one by one so progress is visible;
+                    # a retry after a failure skips them through import_hash
+                    await self.session.commit()
+                    await on_progress(accepted_rows + skipped_rows + duplicate_rows)
+        except (
+            pd.errors.EmptyDataError,
+            pd.errors.ParserError,
+            UnicodeDecodeError,
+        ):
+            await self.session.rollback()
+            raise HTTPException(status_code=400, detail="Arquivo CSV inválido")
+
+        await self.session.commit()
+
+        elapsed_seconds = time.perf_counter() - started_at
+        total_rows = accepted_rows + skipped_rows + duplicate_rows
+
+        return TransactionImportCsvResult(
+            acceptedRows=accepted_rows,
+            skippedRows=skipped_rows,
+            duplicateRows=duplicate_rows,
+            elapsedSeconds=elapsed_seconds,
+            rowsPerSecond=total_rows / elapsed_seconds if elapsed_seconds else 0.0,
+        )
 
-            transaction = {
-                "name": row["title"],
-                "description": f"Importado pelo {transaction_import_csv.bank_name.capitalize()}",
-                "value": row["amount"],
-                "transaction_date": transaction_date,
-                "type": TransactionType.OUTCOME,
-            }
+    @staticmethod
+    def _get_transactions_from_nubank_csv(
+        df: "pd.DataFrame",
+        bank_name: str,
+        transaction_date: datetime,
+        tag_ids_by_name: dict[str, int],
+        user_id: int,
+        occurrences: Counter,
+    ):
+        if not NUBANK_CSV_REQUIRED_COLUMNS.issubset(df.columns):
+            raise HTTPException(status_code=400, detail="Arquivo CSV inválido")
 
-            if category:
-                tag_name = get_tag_name_by_nubank_category_name(category)
+        valid_rows = df["amount"].notna() & (df["amount"] >= 0) & df["title"].notna()
+        df = df[valid_rows]
 
-                if tag_name:
-                    tag = self.tag_repository.get_tag_by_name(tag_name)
-                    transaction["tag_id"] = tag.id
+        if "category" in df.columns:
+            tag_names = df["category"].map(NUBANK_CATEGORY_TAG_NAMES).fillna("Outros")
+            tag_ids = tag_names.map(tag_ids_by_name)
 
-            transaction_to_create.append(transaction)
+            if tag_ids.isna().any():
+                raise HTTPException(status_code=404, detail="Tag not found")
 
-        self.transaction_repository.create_transactions_from_csv(
-            transaction_to_create, current_user.id
-        )
+            tag_ids = tag_ids.astype(int).tolist()
+        else:
+            tag_ids = [None] * len(df)
 
-    def export_transactions_csv(self, year_month: str, current_user: Users):
+        description = f"Importado pelo {bank_name.capitalize()}"
+        transaction_date = transaction_date.date()
+        transaction_to_create = []
+        for name, value, tag_id in zip(
+            df["title"].astype(str).tolist(),
+            df["amount"].astype(float).tolist(),
+            tag_ids,
+        ):
+            occurrence_key = (ImportHashUtils.normalize_text(name), round(value, 2))
+            occurrences[occurrence_key] += 1
+            transaction_to_create.append(
+                {
+                    "name": name,
+                    "description": description,
+                    "value": value,
+                    "transaction_date": transaction_date,
+                    "type": TransactionType.OUTCOME,
+                    "tag_id": tag_id,
+                    "import_hash": ImportHashUtils.get_import_hash(
+                        user_id,
+                        transaction_date,
+                        name,
+                        value,
+                        bank_name,
+                        occurrences[occurrence_key],
+                    ),
+                }
+            )
+
+        return transaction_to_create, int((~valid_rows).sum())
+
+    async def export_transactions_csv(
+        self,
+        year_month: str,
+        current_user: UserPrincipal,
+        on_progress: ProgressCallback | None = None,
+    ):
         first_day_of_month, last_day_of_month = (
             DateUtils.get_first_last_date_from_year_month(year_month)
         )
 
-        transactions = self.transaction_repository.get_transactions_by_date_between(
-            current_user.id, first_day_of_month, last_day_of_month
+        csv_content = "".join(
+            [
+                chunk
+                async for chunk in self.stream_transactions_csv(
+                    first_day_of_month, last_day_of_month, current_user, on_progress
+                )
+            ]
         )
+        csv_base64 = base64.b64encode(csv_content.encode()).decode()
+
+        return {"base_64": csv_base64}
+
+    async def stream_transactions_csv(
+        self,
+        initial_date: date,
+        end_date: date,
+        current_user: UserPrincipal,
+        on_progress: ProgressCallback | None = None,
+    ):
+        if on_progress is None:
+            transactions = (
+                self.transaction_repository.stream_transactions_by_date_between(
+                    current_user.id, initial_date, end_date
+                )
+            )
+        else:
+            # progress is committed between chunks, which must not happen
+            # while a streaming cursor is still open
+            transactions = self._get_transactions_in_pages(
+                current_user.id, initial_date, end_date
+            )
 
         with StringIO() as csv_buffer:
             csv_writer = csv.writer(csv_buffer)
             csv_writer.writerow(EXPORT_CSV_HEADER)
+
+            index = 0
+            async for transaction in transactions:
+                index += 1
+                csv_writer.writerow(
+                    [
+                        transaction.name,
+                        transaction.value,
+                        transaction.description,
+                        transaction.transaction_date,
+                        transaction.type.value,
+                        transaction.tag.name if transaction.tag else None,
+                    ]
+                )
+
+                if index % EXPORT_CSV_CHUNK_SIZE == 0:
+                    if on_progress is not None:
+                        await on_progress(index)
+                    yield csv_buffer.getvalue()
+                    csv_buffer.seek(0)
+                    csv_buffer.truncate(0)
+
+            if on_progress is not None:
+                await on_progress(index)
+            yield csv_buffer.getvalue()
+
+    async def _get_transactions_in_pages(
+        self, user_id: int, initial_date: date, end_date: date
+    ):
+        after = None
+        while True:
+            transactions = [
+                transaction
+                async for transaction in self.transaction_repository.stream_transactions_by_date_between(
+                    user_id,
+                    initial_date,
+                    end_date,
+                    after=after,
+                    limit=EXPORT_CSV_CHUNK_SIZE,
+                )
+            ]
             for transaction in transactions:
-                row = [
-                    transaction.name,
-                    transaction.value,
-                    transaction.description,
-                    transaction.transaction_date,
-                    transaction.type,
-                    transaction.tag.name,
-                ]
-                csv_writer.writerow(row)
-            csv_content = csv_buffer.getvalue()
-
-        csv_content = csv_buffer.getvalue()
-        csv_base64 = base64.b64encode(csv_content.encode()).decode()
+                yield transaction
 
-        return {"base_64": csv_base64}
+            if len(transactions) < EXPORT_CSV_CHUNK_SIZE:
+                return
 
-    def get_transactions(self, year_month: str, current_user: Users):
+            after = (transactions[-1].transaction_date, transactions[-1].id)
+
+    async def get_transactions(self, year_month: str, current_user: UserPrincipal):
         first_day_of_month, last_day_of_month = (
             DateUtils.get_first_last_date_from_year_month(year_month)
         )
 
-        return self.transaction_repository.get_transactions_by_date_between(
+        return await self.transaction_repository.get_transaction_rows_by_date_between(
             current_user.id, first_day_of_month, last_day_of_month
         )
 
-    def get_months_with_transactions(self, current_user: Users):
+    async def get_transactions_etag(self, year_month: str, current_user: UserPrincipal):
+        version = await self.transaction_month_version_repository.get_version(
+            current_user.id, DateUtils.get_year_month_bucket_from_year_month(year_month)
+        )
+        tags_version = await self.tag_repository.get_tags_version()
+
+        return f'"transactions-{current_user.id}-{year_month}-{version}-{tags_version}"'
+
+    async def get_transactions_page(
+        self,
+        initial_date: date,
+        end_date: date,
+        cursor: str | None,
+        limit: int,
+        current_user: UserPrincipal,
+    ):
+        self.validate_date_range(initial_date, end_date)
+
+        after = CursorUtils.decode_transaction_cursor(cursor) if cursor else None
+        transactions = [
+            transaction
+            async for transaction in self.transaction_repository.stream_transactions_by_date_between(
+                current_user.id, initial_date, end_date, after=after, limit=limit + 1
+            )
+        ]
+
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            last_transaction = transactions[-1]
+            next_cursor = CursorUtils.encode_transaction_cursor(
+                last_transaction.transaction_date, last_transaction.id
+            )
+
+        return {"items": transactions, "nextCursor": next_cursor}
+
+    async def search_transactions(
+        self,
+        filters: TransactionSearchFilters,
+        cursor: str | None,
+        limit: int,
+        current_user: UserPrincipal,
+    ):
+        if filters.from_date is not None and filters.to_date is not None:
+            self.validate_date_range(filters.from_date, filters.to_date)
+        if (
+            filters.min_value is not None
+            and filters.max_value is not None
+            and filters.min_value > filters.max_value
+        ):
+            raise HTTPException(
+                status_code=400, detail="Valor mínimo maior que o valor máximo"
+            )
+
+        after = CursorUtils.decode_transaction_cursor(cursor) if cursor else None
+        transactions = await self.transaction_repository.search_transaction_rows(
+            current_user.id, filters, after, limit + 1
+        )
+
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            last_transaction = transactions[-1]
+            next_cursor = CursorUtils.encode_transaction_cursor(
+                last_transaction.transaction_date, last_transaction.id
+            )
+
+        return {"items": transactions, "nextCursor": next_cursor}
+
+    async def get_months_with_transactions_etag(self, current_user: UserPrincipal):
+        versions_total = (
+            await self.transaction_month_version_repository.get_versions_total(
+                current_user.id
+            )
+        )
+
+        return f'"transaction-months-{current_user.id}-{versions_total}"'
+
+    async def get_months_with_transactions(self, current_user: UserPrincipal):
         months_with_transactions = (
-            self.transaction_repository.find_months_with_transactions(current_user.id)
+            await self.transaction_rollup_repository.find_months_with_transactions(
+                current_user.id
+            )
         )
 
         response = [
@@ -161,23 +602,28 @@ class TransactionService:
 
         return response
 
-    def get_transaction_summary(self, year_month: str, current_user: Users):
+    async def get_transaction_summary_etag(
+        self, year_month: str, current_user: UserPrincipal
+    ):
+        version = await self.transaction_month_version_repository.get_version(
+            current_user.id, DateUtils.get_year_month_bucket_from_year_month(year_month)
+        )
+
+        return f'"summary-{current_user.id}-{year_month}-{version}"'
+
+    async def get_transaction_summary(
+        self, year_month: str, current_user: UserPrincipal
+    ):
         first_day_of_month, last_day_of_month = (
             DateUtils.get_first_last_date_from_year_month(year_month)
         )
-        transactions = self.transaction_repository.get_transactions_by_date_between(
-            current_user.id, first_day_of_month, last_day_of_month
+        totals = await self.transaction_rollup_repository.get_rollup_totals(
+            current_user.id, DateUtils.get_year_month_bucket(first_day_of_month)
         )
+        totals_by_type = {row.type: row.total for row in totals}
 
-        outcome_transactions = [
-            t for t in transactions if t.type == TransactionType.OUTCOME
-        ]
-        income_transactions = [
-            t for t in transactions if t.type == TransactionType.INCOME
-        ]
-
-        total_outcome = sum(transactions.value for transactions in outcome_transactions)
-        total_income = sum(transactions.value for transactions in income_transactions)
+        total_outcome = totals_by_type.get(TransactionType.OUTCOME, 0.0)
+        total_income = totals_by_type.get(TransactionType.INCOME, 0.0)
         profit = total_income - total_outcome
 
         summary = TransactionSummary(
@@ -191,18 +637,152 @@ class TransactionService:
 
         return summary
 
-    def delete_transaction(
+    async def get_transaction_summary_by_tag(
+        self, year_month: str, current_user: UserPrincipal
+    ):
+        first_day_of_month, last_day_of_month = (
+            DateUtils.get_first_last_date_from_year_month(year_month)
+        )
+        totals = await self.transaction_rollup_repository.get_rollup_totals(
+            current_user.id,
+            DateUtils.get_year_month_bucket(first_day_of_month),
+            group_by_tag=True,
+        )
+
+        return TransactionSummaryByTag(
+            formattedDate=DateUtils.get_formatted_date(year_month),
+            initialDate=first_day_of_month,
+            lastDate=last_day_of_month,
+            tags=self._get_tag_summaries(totals),
+        )
+
+    async def get_transaction_summary_series(
+        self,
+        from_year_month: str,
+        to_year_month: str,
+        group_by_tag: bool,
+        current_user: UserPrincipal,
+    ):
+        month_count = DateUtils.count_year_months_between(
+            from_year_month, to_year_month
+        )
+        if month_count < 1:
+            raise HTTPException(
+                status_code=400, detail="Data inicial maior que a data final"
+            )
+        if month_count > SUMMARY_SERIES_MAX_MONTHS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Período máximo de {SUMMARY_SERIES_MAX_MONTHS} meses",
+            )
+
+        year_months = DateUtils.get_year_months_between(from_year_month, to_year_month)
+
+        totals = await self.transaction_rollup_repository.get_rollup_series(
+            current_user.id,
+            DateUtils.get_year_month_bucket_from_year_month(from_year_month),
+            DateUtils.get_year_month_bucket_from_year_month(to_year_month),
+            group_by_tag=group_by_tag,
+        )
+
+        totals_by_month = {}
+        for row in totals:
+            totals_by_month.setdefault(row.year_month, []).append(row)
+
+        series = []
+        for year_month in year_months:
+            month_totals = totals_by_month.get(
+                DateUtils.get_year_month_bucket_from_year_month(year_month), []
+            )
+            total_outcome = sum(
+                row.total for row in month_totals if row.type == TransactionType.OUTCOME
+            )
+            total_income = sum(
+                row.total for row in month_totals if row.type == TransactionType.INCOME
+            )
+
+            series.append(
+                TransactionSummarySeriesMonth(
+                    date=year_month,
+                    formattedDate=DateUtils.get_formatted_date(year_month),
+                    totalOutcome=total_outcome,
+                    totalIncome=total_income,
+                    profit=total_income - total_outcome,
+                    tags=(
+                        self._get_tag_summaries(month_totals) if group_by_tag else None
+                    ),
+                )
+            )
+
+        return series
+
+    @staticmethod
+    def _get_tag_summaries(totals):
+        totals_by_tag = {}
+        for row in totals:
+            tag_totals = totals_by_tag.setdefault(
+                row.tag_id,
+                {
+                    "tag": (
+                        TagPublic(id=row.tag_id, name=row.tag_name)
+                        if row.tag_id is not None
+                        else None
+                    ),
+                    TransactionType.OUTCOME: 0.0,
+                    TransactionType.INCOME: 0.0,
+                },
+            )
+            tag_totals[row.type] = row.total
+
+        return [
+            TransactionTagSummary(
+                tag=tag_totals["tag"],
+                totalOutcome=tag_totals[TransactionType.OUTCOME],
+                totalIncome=tag_totals[TransactionType.INCOME],
+                profit=tag_totals[TransactionType.INCOME]
+                - tag_totals[TransactionType.OUTCOME],
+            )
+            for tag_totals in totals_by_tag.values()
+        ]
+
+    async def delete_transaction(
         self,
-        current_user: Users,
+        current_user: UserPrincipal,
         transaction_id: int,
     ):
-        transaction = self.get_transaction_by_id(transaction_id, current_user)
-        self.transaction_repository.delete_transaction(transaction.id)
+        transaction = await self.get_transaction_by_id(transaction_id, current_user)
+        await self.transaction_repository.delete_transaction(transaction)
+
+    @staticmethod
+    def validate_date_range(initial_date: date, end_date: date):
+        if initial_date > end_date:
+            raise HTTPException(
+                status_code=400, detail="Data inicial maior que a data final"
+            )
 
-    def get_transaction_by_id(self, id: int, current_user):
-        transaction = self.transaction_repository.get_transaction_by_id(id)
+    async def get_transaction_by_id(self, id: int, current_user):
+        transaction = await self.transaction_repository.get_transaction_by_id(id)
 
-        if transaction.user_id != current_user.id:
+        if not transaction or transaction.user_id != current_user.id:
             raise HTTPException(status_code=404, detail="Transaction not found!")
 
         return transaction
+
+
+def parse_nubank_csv(
+    csv_content: bytes,
+    bank_name: str,
+    transaction_date: datetime,
+    tag_ids_by_name: dict[str, int],
+    user_id: int,
+):
+    import pandas as pd
+
+    occurrences = Counter()
+
+    return [
+        TransactionService._get_transactions_from_nubank_csv(
+            df, bank_name, transaction_date, tag_ids_by_name, user_id, occurrences
+        )
+        for df in pd.read_csv(BytesIO(csv_content), chunksize=IMPORT_CSV_CHUNK_SIZE)
+    ]
@@ -1,18 +1,18 @@
 from fastapi import HTTPException
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.repository.user_repository import UserRepository
 from app.schemas import UserCreate
 
 
 class UserService:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
         self.user_repository = UserRepository(session)
 
-    def create_user(self, user: UserCreate):
-        existent_user = self.user_repository.get_user_by_email(user.email)
+    async def create_user(self, user: UserCreate):
+        existent_user = await self.user_repository.get_user_by_email(user.email)
         if existent_user:
             raise HTTPException(status_code=400, detail="Email já cadastrado")
 
-        return self.user_repository.create_user(user)
+        return await self.user_repository.create_user(user)
@@ -0,0 +1,20 @@
+import base64
+from datetime import date
+
+from fastapi import HTTPException
+
+
+class CursorUtils:
+    @staticmethod
+    def encode_transaction_cursor(transaction_date: date, transaction_id: int) -> str:
+        raw_cursor = f"{transaction_date.isoformat()}|{transaction_id}"
+        return base64.urlsafe_b64encode(raw_cursor.encode()).decode()
+
+    @staticmethod
+    def decode_transaction_cursor(cursor: str) -> tuple[date, int]:
+        try:
+            raw_cursor = base64.urlsafe_b64decode(cursor.encode()).decode()
+            transaction_date, transaction_id = raw_cursor.split("|")
+            return date.fromisoformat(transaction_date), int(transaction_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cursor inválido")
@@ -1,5 +1,5 @@
 import calendar
-from datetime import datetime
+from datetime import date, datetime
 
 
 class DateUtils:
@@ -37,3 +37,31 @@ class DateUtils:
         ).date()
 
         return first_day_of_month, last_day_of_month
+
+    @staticmethod
+    def get_year_month_bucket(value: date) -> int:
+        return value.year * 100 + value.month
+
+    @staticmethod
+    def get_year_month_bucket_from_year_month(year_month: str) -> int:
+        return DateUtils.get_year_month_bucket(datetime.strptime(year_month, "%Y-%m"))
+
+    @staticmethod
+    def count_year_months_between(from_year_month: str, to_year_month: str) -> int:
+        first = datetime.strptime(from_year_month, "%Y-%m")
+        last = datetime.strptime(to_year_month, "%Y-%m")
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+
+    @staticmethod
+    def get_year_months_between(from_year_month: str, to_year_month: str):
+        current = datetime.strptime(from_year_month, "%Y-%m").date()
+        last = datetime.strptime(to_year_month, "%Y-%m").date()
+
+        year_months = []
+        while current <= last:
+            year_months.append(current.strftime("%Y-%m"))
+            current = date(
+                current.year + current.month // 12, current.month % 12 + 1, 1
+            )
+
+        return year_months
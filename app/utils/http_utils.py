@@ -0,0 +1,91 @@
+import ipaddress
+import math
+import os
+
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+
+IPNetwork = ipaddress.IPv4Network | ipaddress.IPv6Network
+ANY_PROXY = (ipaddress.ip_network("0.0.0.0/0"), ipaddress.ip_network("::/0"))
+
+
+def parse_trusted_proxies(value: str) -> tuple[IPNetwork, ...]:
+    proxies = [proxy.strip() for proxy in value.split(",") if proxy.strip()]
+    if "*" in proxies:
+        return ANY_PROXY
+
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+# Proxies (IPs or CIDRs, comma separated, "*" for any) whose X-Forwarded-For
+# is believed when resolving the client address
+TRUSTED_PROXIES = parse_trusted_proxies(os.getenv("TRUSTED_PROXIES", ""))
+
+# Carries the time of the client's last write back to it, so any instance can
+# keep its next reads on the primary while the replica catches up
+LAST_WRITE_COOKIE = "last_write_at"
+LAST_WRITE_HEADER = "X-Last-Write-At"
+
+
+class HttpUtils:
+    @staticmethod
+    def etag_matches(request: Request, etag: str) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if not if_none_match:
+            return False
+
+        request_etags = [
+            request_etag.strip().removeprefix("W/")
+            for request_etag in if_none_match.split(",")
+        ]
+        return "*" in request_etags or etag in request_etags
+
+    @staticmethod
+    def is_trusted_proxy(host: str, trusted_proxies: tuple[IPNetwork, ...]) -> bool:
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            # a peer without an IP (e.g. a unix socket) is only trusted by "*"
+            return trusted_proxies == ANY_PROXY
+
+        return any(address in proxy for proxy in trusted_proxies)
+
+    @staticmethod
+    def get_client_ip(
+        request: Request, trusted_proxies: tuple[IPNetwork, ...] = TRUSTED_PROXIES
+    ) -> str:
+        peer_host = request.client.host if request.client else "unknown"
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if not forwarded_for or not HttpUtils.is_trusted_proxy(
+            peer_host, trusted_proxies
+        ):
+            return peer_host
+
+        # walk the chain from the nearest hop; the first address that isn't
+        # one of our proxies is the client (earlier entries can be spoofed)
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not HttpUtils.is_trusted_proxy(hop, trusted_proxies):
+                return hop
+
+        return hops[0] if hops else peer_host
+
+    @staticmethod
+    def get_last_write_at(request: Request) -> float | None:
+        last_write_at = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(
+            LAST_WRITE_COOKIE
+        )
+        try:
+            return float(last_write_at) if last_write_at else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def set_last_write_at(headers: MutableHeaders, written_at: float, max_age: float):
+        last_write_at = f"{written_at:.3f}"
+        headers.append(LAST_WRITE_HEADER, last_write_at)
+        headers.append(
+            "Set-Cookie",
+            f"{LAST_WRITE_COOKIE}={last_write_at}; Max-Age={math.ceil(max_age)}; "
+            "Path=/; HttpOnly; SameSite=Lax",
+        )
@@ -0,0 +1,31 @@
+import hashlib
+from datetime import date
+
+
+class ImportHashUtils:
+    @staticmethod
+    def normalize_text(value: str) -> str:
+        return " ".join(value.split()).casefold()
+
+    @staticmethod
+    def get_import_hash(
+        user_id: int,
+        transaction_date: date,
+        name: str,
+        value: float,
+        bank_name: str,
+        occurrence: int,
+    ) -> str:
+        # occurrence tells apart identical purchases within the same statement,
+        # so re-importing the file maps every row back onto the same hash
+        content = "\x1f".join(
+            [
+                str(user_id),
+                transaction_date.isoformat(),
+                ImportHashUtils.normalize_text(name),
+                f"{value:.2f}",
+                ImportHashUtils.normalize_text(bank_name),
+                str(occurrence),
+            ]
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
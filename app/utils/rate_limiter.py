@@ -0,0 +1,97 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Protocol
+
+from fastapi import HTTPException
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true")
+RATE_LIMIT_CAPACITY = float(os.getenv("RATE_LIMIT_CAPACITY", "60"))
+RATE_LIMIT_REFILL_PER_SECOND = float(os.getenv("RATE_LIMIT_REFILL_PER_SECOND", "1"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+
+class RateLimitCost:
+    LOGIN = 5
+    SIGN_UP = 5
+    IMPORT_CSV = 10
+    EXPORT_CSV = 5
+
+
+class RateLimitBackend(Protocol):
+    # Takes cost tokens from the bucket at key, returning 0 when they were
+    # taken or else the seconds until the bucket holds enough. A shared store
+    # (e.g. Redis running the same math in a script) lets every instance
+    # draw from the same buckets.
+    async def take(
+        self, key: str, cost: float, capacity: float, refill_per_second: float
+    ) -> float: ...
+
+
+class InMemoryRateLimitBackend:
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(
+        self, key: str, cost: float, capacity: float, refill_per_second: float
+    ) -> float:
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+            if tokens >= cost:
+                tokens -= cost
+                retry_after = 0.0
+            else:
+                retry_after = (cost - tokens) / refill_per_second
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+
+            # an evicted bucket comes back full, which only errs on allowing
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return retry_after
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        capacity: float,
+        refill_per_second: float,
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.enabled = enabled
+
+    async def check(self, key: str, cost: float):
+        if not self.enabled:
+            return
+
+        retry_after = await self.backend.take(
+            key, min(cost, self.capacity), self.capacity, self.refill_per_second
+        )
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Muitas requisições, tente novamente mais tarde",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+rate_limiter = RateLimiter(
+    InMemoryRateLimitBackend(RATE_LIMIT_MAX_KEYS),
+    RATE_LIMIT_CAPACITY,
+    RATE_LIMIT_REFILL_PER_SECOND,
+    RATE_LIMIT_ENABLED,
+)
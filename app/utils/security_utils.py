@@ -4,20 +4,41 @@ from datetime import datetime, timedelta, timezone
 import jwt
 from passlib.context import CryptContext
 
+from app.utils.password_hash_executor import PasswordHashExecutor
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_PENDING = int(
+    os.getenv("PASSWORD_HASH_MAX_PENDING", PASSWORD_HASH_WORKERS * 4)
+)
+
 
 class AuthUtils:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = CryptContext(
+        schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+    )
+    password_hash_executor = PasswordHashExecutor(
+        PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+    )
     jwt_secret_key = os.getenv("JWT_SECRET_KEY")
     jwt_algorithm = os.getenv("JWT_ALGORITHM")
     jwt_access_token_expire_minutes = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES"))
 
     @staticmethod
-    def verify_password(plain_password, hashed_password):
-        return AuthUtils.pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(plain_password, hashed_password):
+        return await AuthUtils.password_hash_executor.run(
+            AuthUtils.pwd_context.verify, plain_password, hashed_password
+        )
 
     @staticmethod
-    def get_password_hash(password):
-        return AuthUtils.pwd_context.hash(password)
+    async def get_password_hash(password):
+        return await AuthUtils.password_hash_executor.run(
+            AuthUtils.pwd_context.hash, password
+        )
+
+    @staticmethod
+    def password_needs_rehash(hashed_password):
+        return AuthUtils.pwd_context.needs_update(hashed_password)
 
     @staticmethod
     def create_access_token(data: dict):
@@ -30,3 +51,9 @@ class AuthUtils:
             to_encode, AuthUtils.jwt_secret_key, algorithm=AuthUtils.jwt_algorithm
         )
         return encoded_jwt
+
+    @staticmethod
+    def decode_access_token(token: str):
+        return jwt.decode(
+            token, AuthUtils.jwt_secret_key, algorithms=[AuthUtils.jwt_algorithm]
+        )
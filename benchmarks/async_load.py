@@ -0,0 +1,265 @@
+"""Load benchmark comparing the sync and async request stacks.
+
+    python -m benchmarks.async_load --baseline-rev <sync-commit> --concurrency 256
+
+Checks out --baseline-rev (the last commit with the sync Session stack) into a
+temporary git worktree, seeds one throwaway database and then runs uvicorn
+against it twice: once from the baseline worktree and once from the current
+tree. Each server gets --requests authenticated GETs from --concurrency
+concurrent clients and the output is requests/sec and latency percentiles.
+Pass --database-url to load a Postgres/MySQL database instead of SQLite
+(point it at an empty database, the tables are created with SQLModel
+metadata).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import httpx
+from passlib.context import CryptContext
+from sqlalchemy import insert
+from sqlmodel import SQLModel, create_engine
+
+from app.models import Tag, Transaction, TransactionRollup, TransactionType, Users
+from app.utils.date_utils import DateUtils
+
+REPOSITORY_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BENCHMARK_EMAIL = "bench@bench"
+BENCHMARK_PASSWORD = "benchmark-password"
+ENDPOINTS = [
+    "/transactions/range?from=2024-05-01&to=2024-05-31&limit=20",
+    "/transactions/summary?year_month=2024-05",
+    "/transactions/transaction-months",
+]
+
+
+def seed_database(database_url: str, rows: int):
+    engine = create_engine(database_url)
+    SQLModel.metadata.create_all(engine)
+
+    pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    start = date(2024, 1, 1)
+    transactions = [
+        {
+            "name": f"Compra {index}",
+            "value": round(random.uniform(1, 800), 2),
+            "transaction_date": start + timedelta(days=random.randint(0, 180)),
+            "type": random.choice(list(TransactionType)),
+            "tag_id": 1,
+            "user_id": 1,
+        }
+        for index in range(rows)
+    ]
+
+    rollups = {}
+    for transaction in transactions:
+        key = (
+            DateUtils.get_year_month_bucket(transaction["transaction_date"]),
+            transaction["type"],
+        )
+        total_value, transaction_count = rollups.get(key, (0.0, 0))
+        rollups[key] = (total_value + transaction["value"], transaction_count + 1)
+
+    with engine.begin() as connection:
+        connection.execute(insert(Tag), [{"id": 1, "name": "Mercado"}])
+        connection.execute(
+            insert(Users),
+            [
+                {
+                    "id": 1,
+                    "email": BENCHMARK_EMAIL,
+                    "password": pwd_context.hash(BENCHMARK_PASSWORD),
+                }
+            ],
+        )
+        connection.execute(insert(Transaction), transactions)
+        connection.execute(
+            insert(TransactionRollup),
+            [
+                {
+                    "user_id": 1,
+                    "year_month": year_month,
+                    "type": transaction_type,
+                    "tag_id": 1,
+                    "total_value": total_value,
+                    "transaction_count": transaction_count,
+                }
+                for (year_month, transaction_type), (
+                    total_value,
+                    transaction_count,
+                ) in rollups.items()
+            ],
+        )
+    engine.dispose()
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(tree_path: str, database_url: str, port: int, bcrypt_rounds: int = 4):
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "JWT_SECRET_KEY": "benchmark",
+        "JWT_ALGORITHM": "HS256",
+        "JWT_ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+        "BCRYPT_ROUNDS": str(bcrypt_rounds),
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    env.pop("ASYNC_DATABASE_URL", None)
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=tree_path,
+        env=env,
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+
+    server.terminate()
+    raise RuntimeError(f"uvicorn did not start for {tree_path}")
+
+
+async def run_load(port: int, requests: int, concurrency: int):
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        login_response = await client.post(
+            "/login", json={"email": BENCHMARK_EMAIL, "password": BENCHMARK_PASSWORD}
+        )
+        login_response.raise_for_status()
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        latencies = []
+        errors = 0
+        next_request = 0
+
+        async def worker():
+            nonlocal errors, next_request
+            while next_request < requests:
+                endpoint = ENDPOINTS[next_request % len(ENDPOINTS)]
+                next_request += 1
+
+                started_at = time.perf_counter()
+                try:
+                    response = await client.get(endpoint, headers=headers)
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+
+                latencies.append(time.perf_counter() - started_at)
+                if response.status_code != 200:
+                    errors += 1
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed_seconds = time.perf_counter() - started_at
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests_per_second": len(latencies) / elapsed_seconds,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "errors": errors,
+    }
+
+
+def measure(label, tree_path, database_url, requests, concurrency):
+    port = get_free_port()
+    server = start_server(tree_path, database_url, port)
+    try:
+        result = asyncio.run(run_load(port, requests, concurrency))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(
+        f"{label}: {result['requests_per_second']:8.1f} req/sec, "
+        f"p50 {result['p50_ms']:.1f}ms, p95 {result['p95_ms']:.1f}ms, "
+        f"{result['errors']} errors"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--baseline-rev", required=True)
+    parser.add_argument("--database-url")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    args = parser.parse_args()
+
+    temporary_path = tempfile.mkdtemp()
+    database_url = args.database_url or (
+        f"sqlite:///{os.path.join(temporary_path, 'bench.db')}"
+    )
+    baseline_path = os.path.join(temporary_path, "baseline")
+
+    seed_database(database_url, args.rows)
+    subprocess.run(
+        ["git", "worktree", "add", "--detach", baseline_path, args.baseline_rev],
+        cwd=REPOSITORY_PATH,
+        check=True,
+        capture_output=True,
+    )
+
+    print(
+        f"{args.requests} requests, {args.concurrency} concurrent clients, "
+        f"{args.rows} transactions"
+    )
+    try:
+        measure(
+            f"sync  ({args.baseline_rev})",
+            baseline_path,
+            database_url,
+            args.requests,
+            args.concurrency,
+        )
+        measure(
+            "async (working tree)",
+            REPOSITORY_PATH,
+            database_url,
+            args.requests,
+            args.concurrency,
+        )
+    finally:
+        subprocess.run(
+            ["git", "worktree", "remove", "--force", baseline_path],
+            cwd=REPOSITORY_PATH,
+            check=True,
+        )
+        shutil.rmtree(temporary_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
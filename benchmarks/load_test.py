@@ -0,0 +1,318 @@
+"""Scripted load test over every router, with JSON results for comparing commits.
+
+    python -m benchmarks.load_test --users 10 --transactions-per-user 10000 \\
+        --duration 30 --concurrency 32 --output results.json
+    python -m benchmarks.load_test ... --baseline results.json --max-regression 0.2
+
+Seeds a throwaway SQLite database with benchmarks.seed (or uses
+--database-url, which must point at an empty Postgres/MySQL database, or
+an already seeded one with --skip-seed), starts uvicorn on it and drives a
+weighted mix of login, transaction list, summary, month list, tags, CSV
+export and CSV import requests from --concurrency clients for --duration
+seconds. Each client acts as one of the seeded users and picks months from
+the seeded range. Pass --base-url to load a server that is already running
+against a seeded database instead.
+
+The JSON report holds the commit, the database backend, the run settings and
+request count, errors, throughput and p50/p95/p99 latency per endpoint and
+overall. With --baseline, the run is compared to an earlier report and the
+script exits with status 1 when an endpoint's p95 or the overall throughput
+is worse than the baseline by more than --max-regression.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+import httpx
+from sqlalchemy.engine import make_url
+
+from benchmarks.async_load import REPOSITORY_PATH, get_free_port, start_server
+from benchmarks.seed import BENCHMARK_PASSWORD, seed_database
+
+# (name, weight)
+SCENARIO = [
+    ("login", 5),
+    ("transactions", 25),
+    ("summary", 20),
+    ("transaction-months", 10),
+    ("tags", 15),
+    ("export-csv", 5),
+    ("import-csv", 5),
+]
+IMPORT_CSV_ROWS = 20
+
+
+def get_year_months(years: int):
+    today = date.today()
+    return [
+        f"{year}-{month:02d}"
+        for year in range(today.year - years, today.year + 1)
+        for month in range(1, 13)
+        if date(year, month, 1) <= today
+    ][-12 * years :]
+
+
+def build_import_csv(generator: random.Random, request_number: int):
+    rows = [
+        f"{date.today().isoformat()},supermercado,Carga {request_number}-{index},"
+        f"{generator.uniform(1, 300):.2f}"
+        for index in range(IMPORT_CSV_ROWS)
+    ]
+    csv_content = "date,category,title,amount\n" + "\n".join(rows) + "\n"
+    return base64.b64encode(csv_content.encode()).decode()
+
+
+class LoadDriver:
+    def __init__(self, client: httpx.AsyncClient, users: int, years: int, seed: int):
+        self.client = client
+        self.users = users
+        self.year_months = get_year_months(years)
+        self.generator = random.Random(seed)
+        self.tokens = {}
+        self.latencies = {name: [] for name, _ in SCENARIO}
+        self.errors = {name: 0 for name, _ in SCENARIO}
+        self.request_number = 0
+
+    async def login(self, user_id: int):
+        response = await self.client.post(
+            "/login",
+            json={"email": f"bench{user_id}@bench", "password": BENCHMARK_PASSWORD},
+        )
+        response.raise_for_status()
+        self.tokens[user_id] = response.json()["access_token"]
+        return response
+
+    def send(self, name: str, user_id: int):
+        headers = {"Authorization": f"Bearer {self.tokens[user_id]}"}
+        year_month = self.generator.choice(self.year_months)
+        self.request_number += 1
+
+        if name == "login":
+            return self.login(user_id)
+        if name == "transactions":
+            return self.client.get(
+                "/transactions", params={"year_month": year_month}, headers=headers
+            )
+        if name == "summary":
+            return self.client.get(
+                "/transactions/summary",
+                params={"year_month": year_month},
+                headers=headers,
+            )
+        if name == "transaction-months":
+            return self.client.get("/transactions/transaction-months", headers=headers)
+        if name == "tags":
+            return self.client.get("/tags", headers=headers)
+        if name == "export-csv":
+            return self.client.get(
+                "/transactions/export-csv",
+                params={"year_month": year_month},
+                headers=headers,
+            )
+        return self.client.post(
+            "/transactions/import-csv",
+            json={
+                "bank_name": "nubank",
+                "transactions_date": year_month,
+                "csv_base64": build_import_csv(self.generator, self.request_number),
+            },
+            headers=headers,
+        )
+
+    async def worker(self, user_id: int, deadline: float):
+        names = [name for name, _ in SCENARIO]
+        weights = [weight for _, weight in SCENARIO]
+
+        while time.perf_counter() < deadline:
+            name = self.generator.choices(names, weights=weights)[0]
+
+            started_at = time.perf_counter()
+            try:
+                response = await self.send(name, user_id)
+            except httpx.HTTPError:
+                self.errors[name] += 1
+                continue
+
+            self.latencies[name].append(time.perf_counter() - started_at)
+            if response.status_code >= 400:
+                self.errors[name] += 1
+
+    async def run(self, concurrency: int, duration: float):
+        for user_id in range(1, self.users + 1):
+            await self.login(user_id)
+
+        started_at = time.perf_counter()
+        deadline = started_at + duration
+        await asyncio.gather(
+            *(
+                self.worker(client_number % self.users + 1, deadline)
+                for client_number in range(concurrency)
+            )
+        )
+        return time.perf_counter() - started_at
+
+
+def summarize(latencies: list[float], errors: int, elapsed_seconds: float):
+    if not latencies:
+        return {"requests": 0, "errors": errors, "throughput": 0.0}
+
+    if len(latencies) > 1:
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed_seconds, 2),
+        "p50Ms": round(p50 * 1000, 2),
+        "p95Ms": round(p95 * 1000, 2),
+        "p99Ms": round(p99 * 1000, 2),
+    }
+
+
+def get_commit():
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], cwd=REPOSITORY_PATH, capture_output=True, text=True
+        ).stdout.strip()
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def compare(report: dict, baseline: dict, max_regression: float):
+    regressions = []
+
+    for name, result in report["endpoints"].items():
+        baseline_result = baseline["endpoints"].get(name, {})
+        if "p95Ms" not in result or "p95Ms" not in baseline_result:
+            continue
+
+        limit = baseline_result["p95Ms"] * (1 + max_regression)
+        print(
+            f"{name:>20}: p95 {baseline_result['p95Ms']:.1f}ms -> "
+            f"{result['p95Ms']:.1f}ms",
+            file=sys.stderr,
+        )
+        if result["p95Ms"] > limit:
+            regressions.append(f"{name} p95")
+
+    throughput = report["total"]["throughput"]
+    baseline_throughput = baseline["total"]["throughput"]
+    print(
+        f"{'total':>20}: {baseline_throughput:.1f} -> {throughput:.1f} req/sec",
+        file=sys.stderr,
+    )
+    if throughput < baseline_throughput * (1 - max_regression):
+        regressions.append("total throughput")
+
+    return regressions
+
+
+async def drive(base_url: str, args):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        driver = LoadDriver(client, args.users, args.years, args.seed)
+        elapsed_seconds = await driver.run(args.concurrency, args.duration)
+
+    all_latencies = [
+        latency for latencies in driver.latencies.values() for latency in latencies
+    ]
+    return {
+        "endpoints": {
+            name: summarize(
+                driver.latencies[name], driver.errors[name], elapsed_seconds
+            )
+            for name, _ in SCENARIO
+        },
+        "total": summarize(all_latencies, sum(driver.errors.values()), elapsed_seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url")
+    parser.add_argument("--base-url")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--transactions-per-user", type=int, default=10_000)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    database_url = args.database_url or (
+        f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    )
+    if not (args.skip_seed or args.base_url):
+        seed_database(
+            database_url,
+            args.users,
+            args.transactions_per_user,
+            args.years,
+            args.seed,
+            args.bcrypt_rounds,
+        )
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        port = get_free_port()
+        server = start_server(REPOSITORY_PATH, database_url, port, args.bcrypt_rounds)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        results = asyncio.run(drive(base_url, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        **get_commit(),
+        "database": (
+            None if args.base_url else make_url(database_url).get_backend_name()
+        ),
+        "users": args.users,
+        "transactionsPerUser": args.transactions_per_user,
+        "concurrency": args.concurrency,
+        "durationSeconds": args.duration,
+        **results,
+    }
+    report_json = json.dumps(report, indent=2)
+    print(report_json)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(report_json + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.max_regression)
+        if regressions:
+            print(f"regressions: {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Microbenchmark for password verification throughput at several bcrypt costs.
+
+    python -m benchmarks.login_throughput --rounds 8 10 12 --clients 32
+
+Each run hashes one password at the given cost and then has --clients
+concurrent asyncio tasks verify it through a PasswordHashExecutor (the same executor the
+login endpoint uses) for --seconds. The output is verified logins/sec and how many
+attempts were rejected with 503 because the queue was full.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.utils.password_hash_executor import PasswordHashExecutor
+
+
+async def measure(
+    rounds: int, clients: int, seconds: float, workers: int, max_pending: int
+):
+    pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    password_hash = pwd_context.hash("benchmark-password")
+    executor = PasswordHashExecutor(workers, max_pending)
+
+    verified = 0
+    rejected = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        nonlocal verified, rejected
+        while time.perf_counter() < deadline:
+            try:
+                await executor.run(
+                    pwd_context.verify, "benchmark-password", password_hash
+                )
+                verified += 1
+            except HTTPException:
+                rejected += 1
+                await asyncio.sleep(0.01)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed_seconds = time.perf_counter() - started_at
+
+    return verified / elapsed_seconds, rejected
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, nargs="+", default=[8, 10, 12])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-pending", type=int)
+    args = parser.parse_args()
+
+    max_pending = args.max_pending
+    if max_pending is None:
+        max_pending = args.workers * 4
+
+    print(
+        f"{args.clients} clients, {args.workers} workers, "
+        f"{max_pending} pending slots, {args.seconds}s per cost"
+    )
+    for rounds in args.rounds:
+        logins_per_second, rejected = asyncio.run(
+            measure(rounds, args.clients, args.seconds, args.workers, max_pending)
+        )
+        print(
+            f"bcrypt rounds={rounds:>2}: {logins_per_second:8.1f} logins/sec, "
+            f"{rejected} rejected with 503"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Benchmark for the Nubank CSV import pipeline.
+
+    python -m benchmarks.nubank_import --rows 100000
+
+Runs the previous row-by-row importer (iterrows, one tag SELECT per row,
+model_validate + add_all) and the current vectorized
+TransactionService.create_transactions_from_csv against fresh SQLite
+databases and prints rows/sec for each.
+"""
+
+import argparse
+import asyncio
+import base64
+import csv
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Tag, Transaction, TransactionType, Users
+from app.schemas import TransactionImportCsv, UserPrincipal
+from app.service.transaction_service import (
+    NUBANK_CATEGORY_TAG_NAMES,
+    TransactionService,
+)
+
+TAG_CSV_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "app", "alembic", "data", "tag.csv"
+)
+NUBANK_CATEGORIES = list(NUBANK_CATEGORY_TAG_NAMES) + ["serviços", "educação", ""]
+
+
+def build_nubank_csv(rows: int) -> str:
+    start = date(2024, 5, 1)
+    with StringIO() as csv_buffer:
+        csv_writer = csv.writer(csv_buffer)
+        csv_writer.writerow(["date", "category", "title", "amount"])
+        for index in range(rows):
+            amount = round(random.uniform(1, 800), 2)
+            if random.random() < 0.05:
+                amount = -amount
+            csv_writer.writerow(
+                [
+                    start + timedelta(days=random.randint(0, 30)),
+                    random.choice(NUBANK_CATEGORIES),
+                    f"Compra {index}",
+                    amount,
+                ]
+            )
+        return csv_buffer.getvalue()
+
+
+def create_database():
+    database_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{database_path}")
+    SQLModel.metadata.create_all(engine)
+
+    with open(TAG_CSV_PATH, encoding="utf-8") as tag_file:
+        tags = [
+            {"id": int(tag_id), "name": name} for tag_id, name in csv.reader(tag_file)
+        ]
+    with engine.begin() as connection:
+        connection.execute(insert(Tag), tags)
+        connection.execute(
+            insert(Users), [{"id": 1, "email": "bench@bench", "password": "x"}]
+        )
+    engine.dispose()
+
+    return database_path
+
+
+def legacy_import(database_path: str, transaction_import_csv: TransactionImportCsv):
+    session = Session(create_engine(f"sqlite:///{database_path}"))
+    transaction_date = datetime.strptime(
+        transaction_import_csv.transactions_date, "%Y-%m"
+    )
+    decoded_csv = base64.b64decode(transaction_import_csv.csv_base64).decode("utf-8")
+    df = pd.read_csv(StringIO(decoded_csv))
+
+    transactions = []
+    for index, row in df.iterrows():
+        category = row.get("category", None)
+        if row["amount"] < 0:
+            continue
+
+        transaction = {
+            "name": row["title"],
+            "description": f"Importado pelo {transaction_import_csv.bank_name.capitalize()}",
+            "value": row["amount"],
+            "transaction_date": transaction_date,
+            "type": TransactionType.OUTCOME,
+        }
+        if category:
+            tag_name = NUBANK_CATEGORY_TAG_NAMES.get(category, "Outros")
+            search_tag = select(Tag).where(Tag.name == tag_name)
+            transaction["tag_id"] = session.exec(search_tag).first().id
+
+        transactions.append(transaction)
+
+    session.add_all(
+        [
+            Transaction.model_validate(transaction, update={"user_id": 1})
+            for transaction in transactions
+        ]
+    )
+    session.commit()
+    session.close()
+
+
+def vectorized_import(database_path: str, transaction_import_csv: TransactionImportCsv):
+    async def import_csv():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+        async with AsyncSession(engine) as session:
+            await TransactionService(session).create_transactions_from_csv(
+                transaction_import_csv, UserPrincipal(id=1, email="bench@bench")
+            )
+        await engine.dispose()
+
+    asyncio.run(import_csv())
+
+
+def run(label, importer, transaction_import_csv, rows):
+    database_path = create_database()
+    started_at = time.perf_counter()
+    importer(database_path, transaction_import_csv)
+    elapsed_seconds = time.perf_counter() - started_at
+    print(f"{label}: {elapsed_seconds:.2f}s, {rows / elapsed_seconds:,.0f} rows/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    transaction_import_csv = TransactionImportCsv(
+        bank_name="nubank",
+        transactions_date="2024-05",
+        csv_base64=base64.b64encode(build_nubank_csv(args.rows).encode()).decode(),
+    )
+
+    print(f"importing {args.rows} synthetic Nubank rows")
+    run(
+        "before: iterrows + per-row tag lookup",
+        legacy_import,
+        transaction_import_csv,
+        args.rows,
+    )
+    run(
+        "after: vectorized + bulk insert",
+        vectorized_import,
+        transaction_import_csv,
+        args.rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
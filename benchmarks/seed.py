@@ -0,0 +1,218 @@
+"""Bulk seeder for benchmark databases.
+
+    python -m benchmarks.seed --database-url sqlite:////tmp/bench.db \\
+        --users 10 --transactions-per-user 10000 --years 3
+
+Creates the schema with SQLModel metadata (point --database-url at an empty
+database: a SQLite file, or a throwaway Postgres/MySQL container such as
+`docker run -e POSTGRES_PASSWORD=bench -p 5432:5432 postgres:16`) and fills
+it with --users users, each with --transactions-per-user transactions spread
+over the last --years years. Tags, types and values follow a fixed
+distribution (mostly groceries, transport and food, a monthly salary,
+occasional travel), and the transaction_rollup table is filled to match so
+summaries read the same data the transactions hold. Rows go in with
+chunked executemany inserts; --seed makes the data reproducible.
+
+Every user is bench<n>@bench with the password below.
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from passlib.context import CryptContext
+from sqlalchemy import insert
+from sqlalchemy.engine import make_url
+from sqlmodel import SQLModel, create_engine
+
+from app.models import (
+    UNTAGGED_TAG_ID,
+    Tag,
+    Transaction,
+    TransactionRollup,
+    TransactionType,
+    Users,
+)
+from app.utils.date_utils import DateUtils
+
+BENCHMARK_PASSWORD = "benchmark-password"
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+INSERT_CHUNK_SIZE = 10_000
+TAG_DATA_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "app", "alembic", "data", "tag.csv"
+)
+
+# (tag_id, weight, merchants, median value) for outcomes
+OUTCOME_PROFILES = [
+    (2, 18, ["Mercado Extra", "Carrefour", "Pão de Açúcar", "Assaí"], 120.0),
+    (3, 12, ["Uber", "99", "Posto Shell", "Metrô"], 25.0),
+    (15, 10, ["iFood", "Rappi", "Zé Delivery"], 55.0),
+    (17, 9, ["Outback", "Madero", "Padaria Pão Quente"], 80.0),
+    (1, 8, ["Aluguel", "Enel", "Sabesp", "Vivo Fibra"], 300.0),
+    (16, 8, ["Amazon", "Mercado Livre", "Magalu"], 150.0),
+    (6, 7, ["Cinemark", "Ingresso.com", "Steam"], 60.0),
+    (14, 6, ["Netflix", "Spotify", "Disney+", "iCloud"], 35.0),
+    (7, 5, ["Shein", "AliExpress", "Shopee"], 90.0),
+    (4, 5, ["Smart Fit", "Drogasil", "Droga Raia"], 110.0),
+    (5, 3, ["Udemy", "Alura", "Livraria Cultura"], 140.0),
+    (8, 2, ["Latam", "Booking", "Airbnb"], 900.0),
+    (10, 2, ["Petz", "Cobasi"], 130.0),
+    (13, 1, ["Growth Supplements"], 150.0),
+    (12, 2, ["Pix", "Transferência"], 70.0),
+    (None, 2, ["Compra no débito"], 40.0),
+]
+INCOME_PROFILES = [
+    (11, 85, ["Salário"], 6500.0),
+    (9, 10, ["Rendimento CDB", "Dividendos"], 250.0),
+    (None, 5, ["Pix recebido"], 300.0),
+]
+INCOME_SHARE = 0.08
+
+
+def load_tags():
+    with open(TAG_DATA_PATH, encoding="utf-8") as tag_file:
+        return [
+            {"id": int(tag_id), "name": name}
+            for tag_id, name in (
+                line.strip().split(",", 1) for line in tag_file if line.strip()
+            )
+        ]
+
+
+def generate_transactions(
+    generator: random.Random, user_id: int, count: int, first_day: date, days: int
+):
+    for index in range(count):
+        if generator.random() < INCOME_SHARE:
+            transaction_type = TransactionType.INCOME
+            profiles = INCOME_PROFILES
+        else:
+            transaction_type = TransactionType.OUTCOME
+            profiles = OUTCOME_PROFILES
+
+        tag_id, _, merchants, median_value = generator.choices(
+            profiles, weights=[profile[1] for profile in profiles]
+        )[0]
+        yield {
+            "name": generator.choice(merchants),
+            "description": f"Compra {index}" if generator.random() < 0.3 else None,
+            "value": round(median_value * generator.lognormvariate(0, 0.6), 2),
+            "transaction_date": first_day + timedelta(days=generator.randrange(days)),
+            "type": transaction_type,
+            "tag_id": tag_id,
+            "user_id": user_id,
+        }
+
+
+def seed_database(
+    database_url: str,
+    users: int,
+    transactions_per_user: int,
+    years: int,
+    seed: int = 0,
+    bcrypt_rounds: int = BCRYPT_ROUNDS,
+):
+    generator = random.Random(seed)
+    engine = create_engine(database_url)
+    SQLModel.metadata.create_all(engine)
+
+    last_day = date.today()
+    days = 365 * years
+    first_day = last_day - timedelta(days=days - 1)
+    password_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=bcrypt_rounds).hash(
+        BENCHMARK_PASSWORD
+    )
+
+    rollups = {}
+    with engine.begin() as connection:
+        connection.execute(insert(Tag), load_tags())
+        connection.execute(
+            insert(Users),
+            [
+                {
+                    "id": user_id,
+                    "email": f"bench{user_id}@bench",
+                    "password": password_hash,
+                }
+                for user_id in range(1, users + 1)
+            ],
+        )
+
+        for user_id in range(1, users + 1):
+            chunk = []
+            for transaction in generate_transactions(
+                generator, user_id, transactions_per_user, first_day, days
+            ):
+                key = (
+                    user_id,
+                    DateUtils.get_year_month_bucket(transaction["transaction_date"]),
+                    transaction["type"],
+                    transaction["tag_id"] or UNTAGGED_TAG_ID,
+                )
+                total_value, transaction_count = rollups.get(key, (0.0, 0))
+                rollups[key] = (
+                    total_value + transaction["value"],
+                    transaction_count + 1,
+                )
+
+                chunk.append(transaction)
+                if len(chunk) == INSERT_CHUNK_SIZE:
+                    connection.execute(insert(Transaction), chunk)
+                    chunk = []
+            if chunk:
+                connection.execute(insert(Transaction), chunk)
+
+        rollup_rows = [
+            {
+                "user_id": user_id,
+                "year_month": year_month,
+                "type": transaction_type,
+                "tag_id": tag_id,
+                "total_value": total_value,
+                "transaction_count": transaction_count,
+            }
+            for (user_id, year_month, transaction_type, tag_id), (
+                total_value,
+                transaction_count,
+            ) in rollups.items()
+        ]
+        for start in range(0, len(rollup_rows), INSERT_CHUNK_SIZE):
+            connection.execute(
+                insert(TransactionRollup),
+                rollup_rows[start : start + INSERT_CHUNK_SIZE],
+            )
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--transactions-per-user", type=int, default=10_000)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bcrypt-rounds", type=int, default=BCRYPT_ROUNDS)
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    seed_database(
+        args.database_url,
+        args.users,
+        args.transactions_per_user,
+        args.years,
+        args.seed,
+        args.bcrypt_rounds,
+    )
+    elapsed_seconds = time.perf_counter() - started_at
+    total_rows = args.users * args.transactions_per_user
+    print(
+        f"seeded {total_rows} transactions for {args.users} users into "
+        f"{make_url(args.database_url).get_backend_name()} in {elapsed_seconds:.1f}s "
+        f"({total_rows / elapsed_seconds:,.0f} rows/sec)"
+    )
+
+
+if __name__ == "__main__":
+    main()
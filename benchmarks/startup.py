@@ -0,0 +1,147 @@
+"""Cold-start benchmark: import time of app.main and time to first response.
+
+    python -m benchmarks.startup --runs 5 --import-budget-ms 2000 \\
+        --first-response-budget-ms 3000
+
+Imports app.main in --runs fresh interpreters under `python -X importtime`
+and prints the median import time with the slowest top-level packages by
+self time. Then starts uvicorn on a throwaway SQLite database --runs times,
+timing process start to the first `/` response and the first login after
+it (the first request that opens a database connection). Exits with status
+1 when a median is over its budget or when app.main pulls in any of
+LAZY_MODULES, which should only load on the request paths that use them.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+from benchmarks.async_load import REPOSITORY_PATH, get_free_port, start_server
+from benchmarks.seed import BENCHMARK_PASSWORD, seed_database
+
+LAZY_MODULES = ["pandas", "numpy", "aiosqlite", "asyncpg", "aiomysql"]
+IMPORT_ENV = {
+    "DATABASE_URL": "sqlite://",
+    "JWT_SECRET_KEY": "benchmark",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+}
+
+
+def measure_import():
+    code = (
+        "import sys, app.main; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPOSITORY_PATH,
+        env={**os.environ, **IMPORT_ENV},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    self_times = defaultdict(int)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        package = module.strip().split(".")[0]
+        self_times[package] += int(self_us)
+        if module.strip() == "app.main":
+            total_us = int(cumulative_us)
+
+    loaded_lazy_modules = [m for m in result.stdout.strip().split(",") if m]
+    return total_us / 1000, self_times, loaded_lazy_modules
+
+
+def measure_first_response(database_url: str):
+    port = get_free_port()
+    started_at = time.perf_counter()
+    server = start_server(REPOSITORY_PATH, database_url, port)
+    try:
+        first_response_ms = (time.perf_counter() - started_at) * 1000
+
+        login_started_at = time.perf_counter()
+        response = httpx.post(
+            f"http://127.0.0.1:{port}/login",
+            json={"email": "bench1@bench", "password": BENCHMARK_PASSWORD},
+        )
+        response.raise_for_status()
+        first_login_ms = (time.perf_counter() - login_started_at) * 1000
+    finally:
+        server.terminate()
+        server.wait()
+
+    return first_response_ms, first_login_ms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--import-budget-ms", type=float, default=2000)
+    parser.add_argument("--first-response-budget-ms", type=float, default=3000)
+    args = parser.parse_args()
+
+    import_times = []
+    self_times = defaultdict(int)
+    loaded_lazy_modules = set()
+    for _ in range(args.runs):
+        total_ms, run_self_times, run_lazy_modules = measure_import()
+        import_times.append(total_ms)
+        loaded_lazy_modules.update(run_lazy_modules)
+        for package, self_us in run_self_times.items():
+            self_times[package] += self_us
+
+    import_ms = statistics.median(import_times)
+    print(f"import app.main: {import_ms:.0f}ms (median of {args.runs})")
+    for package, self_us in sorted(self_times.items(), key=lambda item: -item[1])[
+        : args.top
+    ]:
+        print(f"  {package:<24} {self_us / args.runs / 1000:8.1f}ms")
+
+    database_path = os.path.join(tempfile.mkdtemp(), "startup.db")
+    database_url = f"sqlite:///{database_path}"
+    seed_database(database_url, 1, 0, 1, bcrypt_rounds=4)
+
+    first_responses = []
+    first_logins = []
+    for _ in range(args.runs):
+        first_response_ms, first_login_ms = measure_first_response(database_url)
+        first_responses.append(first_response_ms)
+        first_logins.append(first_login_ms)
+
+    first_response_ms = statistics.median(first_responses)
+    print(f"process start to first response: {first_response_ms:.0f}ms")
+    print(f"first login after start: {statistics.median(first_logins):.0f}ms")
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import {import_ms:.0f}ms > {args.import_budget_ms:.0f}ms")
+    if first_response_ms > args.first_response_budget_ms:
+        failures.append(
+            f"first response {first_response_ms:.0f}ms > "
+            f"{args.first_response_budget_ms:.0f}ms"
+        )
+    if loaded_lazy_modules:
+        failures.append(
+            f"app.main imports {', '.join(sorted(loaded_lazy_modules))} eagerly"
+        )
+
+    if failures:
+        print(f"over budget: {'; '.join(failures)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Benchmark for the month listing query before and after the
+(user_id, transaction_date) / (user_id, year_month) indexes.
+
+    python -m benchmarks.transaction_months --users 50 --rows-per-user 20000
+
+Defaults to a throwaway SQLite file; pass --database-url to run against
+Postgres/MySQL (the tables are created with SQLModel metadata, so point it
+at an empty database).
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func, insert, text
+from sqlmodel import SQLModel, create_engine, select
+
+from app.models import Transaction, TransactionType, Users
+
+INDEXES = [
+    index
+    for index in Transaction.__table__.indexes
+    if index.name
+    in ("ix_transaction_user_id_transaction_date", "ix_transaction_user_id_year_month")
+]
+
+
+def seed(engine, users: int, rows_per_user: int, chunk_size: int = 10_000):
+    start = date(2015, 1, 1)
+    days = (date(2025, 12, 31) - start).days
+
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Users),
+            [
+                {"id": user_id, "email": f"user{user_id}@bench", "password": "x"}
+                for user_id in range(1, users + 1)
+            ],
+        )
+
+        rows = []
+        for user_id in range(1, users + 1):
+            for _ in range(rows_per_user):
+                rows.append(
+                    {
+                        "name": "bench",
+                        "value": round(random.uniform(1, 500), 2),
+                        "transaction_date": start
+                        + timedelta(days=random.randint(0, days)),
+                        "type": random.choice(list(TransactionType)),
+                        "user_id": user_id,
+                    }
+                )
+                if len(rows) >= chunk_size:
+                    connection.execute(insert(Transaction), rows)
+                    rows = []
+        if rows:
+            connection.execute(insert(Transaction), rows)
+
+
+def legacy_query(user_id: int):
+    year = func.extract("year", Transaction.transaction_date)
+    month = func.extract("month", Transaction.transaction_date)
+    return (
+        select(year.label("year"), month.label("month"))
+        .where(Transaction.user_id == user_id)
+        .group_by(year, month)
+        .order_by(year.asc(), month.asc())
+    )
+
+
+def indexed_query(user_id: int):
+    return (
+        select(Transaction.year_month)
+        .where(Transaction.user_id == user_id)
+        .group_by(Transaction.year_month)
+        .order_by(Transaction.year_month.asc())
+    )
+
+
+def explain(connection, statement):
+    prefix = "EXPLAIN QUERY PLAN" if connection.dialect.name == "sqlite" else "EXPLAIN"
+    compiled = statement.compile(
+        dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+    )
+    return [
+        " | ".join(str(column) for column in row)
+        for row in connection.execute(text(f"{prefix} {compiled}"))
+    ]
+
+
+def measure(connection, statement, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        connection.execute(statement).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def report(label, connection, statement, repeat):
+    print(f"--- {label}")
+    for line in explain(connection, statement):
+        print(f"  {line}")
+    print(f"  median latency: {measure(connection, statement, repeat):.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--rows-per-user", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        database_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        database_url = f"sqlite:///{database_path}"
+
+    engine = create_engine(database_url)
+    SQLModel.metadata.create_all(engine)
+    for index in INDEXES:
+        index.drop(engine)
+
+    print(f"seeding {args.users} users x {args.rows_per_user} transactions")
+    seed(engine, args.users, args.rows_per_user)
+
+    user_id = args.users // 2 or 1
+    with engine.connect() as connection:
+        report(
+            "before: extract() grouping, no indexes",
+            connection,
+            legacy_query(user_id),
+            args.repeat,
+        )
+
+    for index in INDEXES:
+        index.create(engine)
+    with engine.begin() as connection:
+        if connection.dialect.name in ("sqlite", "postgresql"):
+            connection.execute(text("ANALYZE"))
+
+    with engine.connect() as connection:
+        report(
+            "after: year_month grouping, indexed",
+            connection,
+            indexed_query(user_id),
+            args.repeat,
+        )
+
+
+if __name__ == "__main__":
+    main()
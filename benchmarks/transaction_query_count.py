@@ -0,0 +1,137 @@
+"""Regression check for N+1 queries on the transaction read paths.
+
+    python -m benchmarks.transaction_query_count --sizes 10 100 1000
+
+Seeds throwaway SQLite databases with a growing number of tagged
+transactions and runs the list, export and single-fetch paths under the
+same per-request SQL counter the middleware uses, serializing every row
+the way the endpoints do. The statement count of each path must not depend
+on the number of rows; the script exits with status 1 when it does.
+tests/test_transaction_query_count.py runs the same check in CI.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.metrics.sql_metrics import RequestSqlStats, request_sql_stats
+from app.models import Tag, Transaction, TransactionType, Users
+from app.schemas import TransactionPublic, UserPrincipal
+from app.service.transaction_service import TransactionService
+
+TAG_COUNT = 8
+CURRENT_USER = UserPrincipal(id=1, email="bench@bench")
+
+
+def create_database(rows: int):
+    database_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{database_path}")
+    SQLModel.metadata.create_all(engine)
+
+    start = date(2024, 5, 1)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Tag),
+            [
+                {"id": tag_id, "name": f"Tag {tag_id}"}
+                for tag_id in range(1, TAG_COUNT + 1)
+            ],
+        )
+        connection.execute(
+            insert(Users), [{"id": 1, "email": "bench@bench", "password": "x"}]
+        )
+        connection.execute(
+            insert(Transaction),
+            [
+                {
+                    "name": f"Compra {index}",
+                    "value": 10.0,
+                    "transaction_date": start + timedelta(days=index % 28),
+                    "type": TransactionType.OUTCOME,
+                    "tag_id": index % TAG_COUNT + 1,
+                    "user_id": 1,
+                }
+                for index in range(rows)
+            ],
+        )
+    engine.dispose()
+
+    return database_path
+
+
+async def list_transactions(transaction_service: TransactionService):
+    transactions = await transaction_service.get_transactions("2024-05", CURRENT_USER)
+    [TransactionPublic.model_validate(transaction) for transaction in transactions]
+
+
+async def export_transactions(transaction_service: TransactionService):
+    await transaction_service.export_transactions_csv("2024-05", CURRENT_USER)
+
+
+async def get_transaction(transaction_service: TransactionService):
+    transaction = await transaction_service.get_transaction_by_id(1, CURRENT_USER)
+    TransactionPublic.model_validate(transaction)
+
+
+READ_PATHS = {
+    "list": list_transactions,
+    "export": export_transactions,
+    "single": get_transaction,
+}
+
+
+async def count_statements(database_path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    statement_counts = {}
+
+    for name, read_path in READ_PATHS.items():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            stats = RequestSqlStats()
+            token = request_sql_stats.set(stats)
+            try:
+                await read_path(TransactionService(session))
+            finally:
+                request_sql_stats.reset(token)
+            statement_counts[name] = stats.statement_count
+
+    await engine.dispose()
+    return statement_counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    counts_by_size = {}
+    for rows in args.sizes:
+        counts_by_size[rows] = asyncio.run(count_statements(create_database(rows)))
+        print(
+            f"{rows:>6} rows: "
+            + ", ".join(
+                f"{name}={count}" for name, count in counts_by_size[rows].items()
+            )
+        )
+
+    growing_paths = [
+        name
+        for name in READ_PATHS
+        if len({counts[name] for counts in counts_by_size.values()}) > 1
+    ]
+    if growing_paths:
+        print(f"query count grows with row count: {', '.join(growing_paths)}")
+        sys.exit(1)
+
+    print("query counts are constant")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Benchmark for transaction search over a large seeded table.
+
+    python -m benchmarks.transaction_search --rows 1000000
+
+Seeds a throwaway SQLite database (the FTS5 shadow table and its triggers
+are created by SQLModel metadata, as in the migration) and times a set of
+searches two ways: a LIKE '%term%' scan over name/description, which is what
+a search without the text index costs, and TransactionRepository's indexed
+search. Common terms fill the first page quickly either way; rare terms and
+misses are where the scan has to read the whole table. Both return the first page in (transaction_date, id) order and the
+script checks they agree.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Tag, Transaction, TransactionType, Users
+from app.repository.transaction_repository import TransactionRepository
+from app.schemas import TransactionSearchFilters
+
+USERS = 10
+PAGE_SIZE = 50
+INSERT_CHUNK_SIZE = 50_000
+MERCHANTS = [
+    "Uber",
+    "iFood",
+    "Mercado Extra",
+    "Padaria Pão Quente",
+    "Farmácia São João",
+    "Posto Shell",
+    "Netflix",
+    "Spotify",
+    "Cinema Cinemark",
+    "Academia Smart Fit",
+    "Restaurante Outback",
+    "Livraria Cultura",
+]
+SEARCHES = [
+    TransactionSearchFilters(query="uber"),
+    TransactionSearchFilters(query="farmácia são"),
+    TransactionSearchFilters(query="cinemark", type=TransactionType.OUTCOME),
+    TransactionSearchFilters(query="mercado", min_value=100, max_value=200),
+    TransactionSearchFilters(
+        query="netflix", from_date=date(2024, 3, 1), to_date=date(2024, 6, 30)
+    ),
+    TransactionSearchFilters(query="pedido 0004242"),
+    TransactionSearchFilters(query="passagem aerea"),
+]
+
+
+def create_database(rows: int):
+    database_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{database_path}")
+    SQLModel.metadata.create_all(engine)
+
+    start = date(2023, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Tag),
+            [{"id": tag_id, "name": f"Tag {tag_id}"} for tag_id in range(1, 9)],
+        )
+        connection.execute(
+            insert(Users),
+            [
+                {"id": user_id, "email": f"bench{user_id}@bench", "password": "x"}
+                for user_id in range(1, USERS + 1)
+            ],
+        )
+        for chunk_start in range(0, rows, INSERT_CHUNK_SIZE):
+            connection.execute(
+                insert(Transaction),
+                [
+                    {
+                        "name": random.choice(MERCHANTS),
+                        "description": random.choice(
+                            ["Importado pelo Nubank", "Compra no cartão"]
+                        )
+                        + f" pedido {index:07d}",
+                        "value": round(random.uniform(1, 800), 2),
+                        "transaction_date": start
+                        + timedelta(days=random.randint(0, 730)),
+                        "type": random.choice(list(TransactionType)),
+                        "tag_id": random.randint(1, 8),
+                        "user_id": random.randint(1, USERS),
+                    }
+                    for index in range(
+                        chunk_start, min(chunk_start + INSERT_CHUNK_SIZE, rows)
+                    )
+                ],
+            )
+    engine.dispose()
+
+    return database_path
+
+
+def build_scan_query(user_id: int, filters: TransactionSearchFilters):
+    conditions = [Transaction.user_id == user_id]
+    for term in filters.query.split():
+        conditions.append(
+            or_(
+                Transaction.name.icontains(term, autoescape=True),
+                Transaction.description.icontains(term, autoescape=True),
+            )
+        )
+    if filters.type is not None:
+        conditions.append(Transaction.type == filters.type)
+    if filters.min_value is not None:
+        conditions.append(Transaction.value >= filters.min_value)
+    if filters.max_value is not None:
+        conditions.append(Transaction.value <= filters.max_value)
+    if filters.from_date is not None:
+        conditions.append(Transaction.transaction_date >= filters.from_date)
+    if filters.to_date is not None:
+        conditions.append(Transaction.transaction_date <= filters.to_date)
+
+    return (
+        select(Transaction.id)
+        .where(and_(*conditions))
+        .order_by(Transaction.transaction_date, Transaction.id)
+        .limit(PAGE_SIZE)
+    )
+
+
+async def time_searches(database_path: str, repeat: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    results = []
+
+    async with AsyncSession(engine) as session:
+        transaction_repository = TransactionRepository(session)
+        for filters in SEARCHES:
+            user_id = random.randint(1, USERS)
+            scan_times = []
+            indexed_times = []
+
+            for _ in range(repeat):
+                started_at = time.perf_counter()
+                scan_ids = (
+                    await session.exec(build_scan_query(user_id, filters))
+                ).all()
+                scan_times.append(time.perf_counter() - started_at)
+
+                started_at = time.perf_counter()
+                indexed_rows = await transaction_repository.search_transaction_rows(
+                    user_id, filters, None, PAGE_SIZE
+                )
+                indexed_times.append(time.perf_counter() - started_at)
+
+            if list(scan_ids) != [row.id for row in indexed_rows]:
+                raise SystemExit(f"results differ for {filters}")
+
+            results.append(
+                (
+                    filters,
+                    statistics.median(scan_times),
+                    statistics.median(indexed_times),
+                )
+            )
+
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    database_path = create_database(args.rows)
+    print(
+        f"seeded {args.rows} transactions for {USERS} users "
+        f"in {time.perf_counter() - started_at:.1f}s"
+    )
+
+    for filters, scan_seconds, indexed_seconds in asyncio.run(
+        time_searches(database_path, args.repeat)
+    ):
+        filters_description = ", ".join(
+            f"{name}={value}"
+            for name, value in filters.model_dump(exclude_none=True).items()
+        )
+        print(
+            f"{filters_description}: LIKE scan {scan_seconds * 1000:.1f}ms, "
+            f"indexed {indexed_seconds * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
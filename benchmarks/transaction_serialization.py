@@ -0,0 +1,152 @@
+"""Benchmark for the GET /transactions read path on 10k rows.
+
+    python -m benchmarks.transaction_serialization --rows 10000
+
+Compares the previous path (hydrate Transaction ORM objects with the tag
+joined, validate them through List[TransactionPublic] and encode with the
+stdlib json module, as FastAPI does for a response_model) with the current
+one (column projection into slotted TransactionRow objects encoded by
+ORJSONResponse). Prints the median load and serialization time of each.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import List
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import joinedload
+from sqlmodel import SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Tag, Transaction, TransactionType, Users
+from app.repository.transaction_repository import TransactionRepository
+from app.schemas import TransactionPublic
+
+TRANSACTION_LIST_ADAPTER = TypeAdapter(List[TransactionPublic])
+
+
+def create_database(rows: int):
+    database_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{database_path}")
+    SQLModel.metadata.create_all(engine)
+
+    start = date(2024, 5, 1)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Tag),
+            [{"id": tag_id, "name": f"Tag {tag_id}"} for tag_id in range(1, 9)],
+        )
+        connection.execute(
+            insert(Users), [{"id": 1, "email": "bench@bench", "password": "x"}]
+        )
+        connection.execute(
+            insert(Transaction),
+            [
+                {
+                    "name": f"Compra {index}",
+                    "description": "Importado pelo Nubank",
+                    "value": round(index * 1.37, 2),
+                    "transaction_date": start + timedelta(days=index % 28),
+                    "type": TransactionType.OUTCOME,
+                    "tag_id": index % 9 or None,
+                    "user_id": 1,
+                }
+                for index in range(rows)
+            ],
+        )
+    engine.dispose()
+
+    return database_path
+
+
+async def load_orm_objects(session: AsyncSession):
+    search_transactions = (
+        select(Transaction)
+        .options(joinedload(Transaction.tag))
+        .where(Transaction.transaction_date >= date(2024, 5, 1))
+        .where(Transaction.transaction_date <= date(2024, 5, 31))
+        .where(Transaction.user_id == 1)
+    )
+    return (await session.exec(search_transactions)).all()
+
+
+def serialize_orm_objects(transactions):
+    validated = TRANSACTION_LIST_ADAPTER.validate_python(
+        transactions, from_attributes=True
+    )
+    content = TRANSACTION_LIST_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+async def load_projected_rows(session: AsyncSession):
+    return await TransactionRepository(session).get_transaction_rows_by_date_between(
+        1, date(2024, 5, 1), date(2024, 5, 31)
+    )
+
+
+def serialize_projected_rows(transactions):
+    return ORJSONResponse(transactions).body
+
+
+async def measure(database_path: str, load, serialize, repeat: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    load_times = []
+    serialize_times = []
+    body = b""
+
+    for _ in range(repeat):
+        async with AsyncSession(engine) as session:
+            started_at = time.perf_counter()
+            transactions = await load(session)
+            load_times.append(time.perf_counter() - started_at)
+
+            started_at = time.perf_counter()
+            body = serialize(transactions)
+            serialize_times.append(time.perf_counter() - started_at)
+
+    await engine.dispose()
+    return statistics.median(load_times), statistics.median(serialize_times), body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    database_path = create_database(args.rows)
+    print(f"{args.rows} transactions, median of {args.repeat} runs")
+
+    bodies = []
+    for label, load, serialize in [
+        (
+            "before: ORM + response_model + json",
+            load_orm_objects,
+            serialize_orm_objects,
+        ),
+        ("after: projection + orjson", load_projected_rows, serialize_projected_rows),
+    ]:
+        load_seconds, serialize_seconds, body = asyncio.run(
+            measure(database_path, load, serialize, args.repeat)
+        )
+        bodies.append(json.loads(body))
+        print(
+            f"{label}: load {load_seconds * 1000:.1f}ms, "
+            f"serialize {serialize_seconds * 1000:.1f}ms"
+        )
+
+    if bodies[0] != bodies[1]:
+        raise SystemExit("response bodies differ")
+
+
+if __name__ == "__main__":
+    main()
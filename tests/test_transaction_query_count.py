@@ -0,0 +1,16 @@
+import asyncio
+
+import pytest
+
+from benchmarks.transaction_query_count import (
+    READ_PATHS,
+    count_statements,
+    create_database,
+)
+
+
+@pytest.mark.parametrize("rows", [10, 100, 1000])
+def test_transaction_read_paths_use_one_statement(rows: int):
+    statement_counts = asyncio.run(count_statements(create_database(rows)))
+
+    assert statement_counts == {name: 1 for name in READ_PATHS}